@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Regenerate the benchmark fixtures in benchmarks/fixtures/
+
+The fixtures are checked in so every run measures the same bytes; this script
+only exists to document how they were made and to rebuild them if the set
+changes. Images are drawn from a fixed seed, audio is synthesized by FFmpeg.
+"""
+
+import random
+import subprocess
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFilter
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# name: (width, height, seed, save options)
+IMAGES = {
+    "original_1200x1500.jpg": (1200, 1500, 1, {"quality": 90}),
+    "result_1080x1920.jpg": (1080, 1920, 2, {"quality": 90}),
+    "result_2048x2048.png": (2048, 2048, 3, {"optimize": True}),
+    "result_1600x1200.webp": (1600, 1200, 4, {"quality": 85}),
+    "result_4000x3000.jpg": (4000, 3000, 5, {"quality": 92}),
+}
+
+# name: (seconds, note frequencies in Hz)
+AUDIO = {
+    "music_8s.mp3": (8, [220, 277, 330]),
+    "music_30s.mp3": (30, [196, 247, 294]),
+}
+
+def draw_scene(width: int, height: int, seed: int) -> Image.Image:
+    """Gradient background with soft shapes, so encoders see photo-like texture"""
+    rng = random.Random(seed)
+    top = tuple(rng.randrange(256) for _ in range(3))
+    bottom = tuple(rng.randrange(256) for _ in range(3))
+
+    image = Image.new("RGB", (width, height))
+    draw = ImageDraw.Draw(image)
+    for y in range(height):
+        t = y / (height - 1)
+        draw.line([(0, y), (width, y)], fill=tuple(round(a + (b - a) * t) for a, b in zip(top, bottom)))
+
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randrange(min(width, height) // 20, min(width, height) // 4)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=color)
+    image = image.filter(ImageFilter.GaussianBlur(radius=min(width, height) // 200 + 2))
+
+    # Sharp detail on top of the blur
+    draw = ImageDraw.Draw(image)
+    for _ in range(120):
+        x, y = rng.randrange(width), rng.randrange(height)
+        length = rng.randrange(20, max(21, width // 6))
+        draw.line([(x, y), (x + length, y + rng.randrange(-length, length))],
+                  fill=tuple(rng.randrange(256) for _ in range(3)), width=rng.randrange(1, 6))
+    return image
+
+def draw_logo(size: int) -> Image.Image:
+    """Translucent RGBA badge like the logos clients upload"""
+    logo = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(logo)
+    draw.ellipse([0, 0, size - 1, size - 1], fill=(255, 255, 255, 220))
+    draw.ellipse([size // 4, size // 4, size * 3 // 4, size * 3 // 4], fill=(230, 60, 90, 255))
+    return logo
+
+def main() -> None:
+    FIXTURES_DIR.mkdir(exist_ok=True)
+
+    for name, (width, height, seed, options) in IMAGES.items():
+        draw_scene(width, height, seed).save(FIXTURES_DIR / name, **options)
+        print(f"Wrote {name}")
+
+    draw_logo(512).save(FIXTURES_DIR / "logo_512.png", optimize=True)
+    print("Wrote logo_512.png")
+
+    for name, (seconds, notes) in AUDIO.items():
+        inputs = []
+        for frequency in notes:
+            inputs += ["-f", "lavfi", "-i", f"sine=frequency={frequency}:sample_rate=44100:duration={seconds}"]
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", *inputs,
+             "-filter_complex", f"amix=inputs={len(notes)},volume=0.6",
+             "-ac", "2", "-c:a", "libmp3lame", "-b:a", "96k", str(FIXTURES_DIR / name)],
+            check=True
+        )
+        print(f"Wrote {name}")
+
+if __name__ == "__main__":
+    main()
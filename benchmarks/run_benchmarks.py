@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the render and ingest hot paths
+
+Times the asset download path, image normalization, every inspix segment
+builder, create_inspix_video end to end (every engine) and
+create_video_from_images. Assets come from the checked-in fixtures, served by a
+local HTTP stand-in, and every run works in a throwaway directory with cold
+caches, so results only depend on the code, FFmpeg and the machine.
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+
+With --baseline the run exits non-zero when any benchmark's median is slower
+than the baseline median by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+RESULTS_VERSION = 1  # Bump when benchmark names or what they measure change
+
+ORIGINAL = "original_1200x1500.jpg"
+RESULTS = ["result_1080x1920.jpg", "result_2048x2048.png", "result_1600x1200.webp", "result_4000x3000.jpg"]
+LOGO = "logo_512.png"
+MUSIC = "music_30s.mp3"
+IMAGE_FIXTURES = [ORIGINAL, *RESULTS, LOGO]
+AUDIO_FIXTURES = ["music_8s.mp3", MUSIC]
+
+MIN_REGRESSION_SECONDS = 0.05  # Slowdowns smaller than this are treated as noise
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request"""
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    """Serve the fixtures on an ephemeral localhost port in a background thread"""
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def ffmpeg_version() -> Optional[str]:
+    try:
+        output = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, timeout=10).stdout
+        return output.splitlines()[0] if output else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+class Suite:
+    """Runs the benchmarks against an imported main module"""
+
+    def __init__(self, main, base_url: str, workspace: Path, profile: str, repeat: int, only: List[str]):
+        self.main = main
+        self.base_url = base_url
+        self.workspace = workspace
+        self.profile = profile
+        self.repeat = repeat
+        self.only = only
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def selected(self, name: str) -> bool:
+        return not self.only or any(pattern in name for pattern in self.only)
+
+    def reset_caches(self) -> None:
+        """Empty every on-disk cache so each iteration measures a cold render"""
+        main = self.main
+        for directory in (main.DOWNLOAD_CACHE_DIR, main.IMAGE_CACHE_DIR, main.SEGMENT_CACHE_DIR, main.RESULT_CACHE_DIR):
+            shutil.rmtree(directory, ignore_errors=True)
+        main.download_cache.blob_dir.mkdir(parents=True, exist_ok=True)
+        main.download_cache.index_dir.mkdir(parents=True, exist_ok=True)
+        main.download_cache.entries.clear()
+        for directory in (main.IMAGE_CACHE_DIR, main.SEGMENT_CACHE_DIR, main.RESULT_CACHE_DIR):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def scratch(self, name: str) -> Path:
+        """Fresh working directory for one iteration"""
+        path = self.workspace / "scratch" / name
+        shutil.rmtree(path, ignore_errors=True)
+        path.mkdir(parents=True)
+        return path
+
+    async def measure(
+        self,
+        name: str,
+        run: Callable[[Path], Awaitable[Any]],
+        cold: bool = True,
+        warmup: bool = False
+    ) -> None:
+        """
+        Time `run` over the configured iterations; a falsy return is a failure.
+        cold empties the caches before every iteration, warmup runs once untimed first.
+        """
+        if not self.selected(name):
+            return
+
+        if warmup and not await run(self.scratch("warmup")):
+            raise RuntimeError(f"Benchmark {name} failed during warmup")
+
+        samples = []
+        for _ in range(self.repeat):
+            if cold:
+                self.reset_caches()
+            scratch = self.scratch(name.replace(".", "_"))
+            started = time.perf_counter()
+            ok = await run(scratch)
+            elapsed = time.perf_counter() - started
+            if not ok:
+                raise RuntimeError(f"Benchmark {name} failed")
+            samples.append(elapsed)
+
+        self.results[name] = {
+            "median": round(statistics.median(samples), 4),
+            "min": round(min(samples), 4),
+            "max": round(max(samples), 4),
+            "samples": [round(sample, 4) for sample in samples],
+        }
+        print(f"{name:<40} median {self.results[name]['median']:8.3f}s  min {self.results[name]['min']:8.3f}s")
+
+    def url(self, fixture: str) -> str:
+        return f"{self.base_url}/{fixture}"
+
+    async def fetch_all(self, scratch: Path) -> bool:
+        main = self.main
+        session = main.get_http_session()
+        downloads = [
+            main.download_image_from_url(session, self.url(name), scratch / name, validate_dimensions=name != LOGO)
+            for name in IMAGE_FIXTURES
+        ]
+        images = await asyncio.gather(*downloads)
+        audio = await asyncio.gather(*[
+            main.download_audio_from_url(session, self.url(name), scratch / name) for name in AUDIO_FIXTURES
+        ])
+        return all(result["success"] for result in images) and all(audio)
+
+    async def run_downloads(self) -> None:
+        main = self.main
+        session = main.get_http_session()
+
+        for name in IMAGE_FIXTURES:
+            await self.measure(
+                f"download.{name}",
+                lambda scratch, name=name: self.download_image(session, name, scratch)
+            )
+        for name in AUDIO_FIXTURES:
+            await self.measure(
+                f"download.{name}",
+                lambda scratch, name=name: main.download_audio_from_url(session, self.url(name), scratch / name)
+            )
+
+        # Every asset at once, cold, then again answered by conditional GET revalidation
+        await self.measure("download.all_cold", self.fetch_all)
+        await self.measure("download.all_revalidated", self.fetch_all, cold=False, warmup=True)
+
+    async def download_image(self, session, name: str, scratch: Path) -> bool:
+        result = await self.main.download_image_from_url(session, self.url(name), scratch / name, validate_dimensions=name != LOGO)
+        return result["success"]
+
+    async def run_normalize(self) -> None:
+        main = self.main
+
+        async def normalize(scratch: Path) -> bool:
+            await asyncio.gather(
+                main.image_variant_cache.get(FIXTURES_DIR / ORIGINAL, ["letterbox"], scratch),
+                *[main.image_variant_cache.get(FIXTURES_DIR / name, ["cover", "grid"], scratch) for name in RESULTS]
+            )
+            return True
+
+        await self.measure("normalize.images", normalize)
+
+    async def run_segments(self) -> None:
+        main = self.main
+        fps = 30
+        profile = self.profile
+
+        # Builders take the normalized variants, exactly as create_inspix_video passes them
+        inputs = self.workspace / "segment_inputs"
+        inputs.mkdir(exist_ok=True)
+        original = (await main.image_variant_cache.get(FIXTURES_DIR / ORIGINAL, ["letterbox"], inputs))["letterbox"]
+        variants = [await main.image_variant_cache.get(FIXTURES_DIR / name, ["cover", "grid"], inputs) for name in RESULTS]
+        covers = [variant["cover"] for variant in variants]
+        grid = [variant["grid"] for variant in variants]
+        logo = FIXTURES_DIR / LOGO
+        styles = [f"Style {i + 1}" for i in range(len(covers))]
+
+        builders = {
+            "hook_grid": lambda out: main.create_hook_grid(grid, out, fps, prescaled=True, profile=profile),
+            "original_photo": lambda out: main.create_original_photo_segment(original, out, fps, profile),
+            "prompt_tease": lambda out: main.create_prompt_tease_segment(original, "Four looks, one photo", out, fps, profile),
+            "results_showcase": lambda out: main.create_results_showcase(covers, styles, out, fps, profile),
+            "branding": lambda out: main.create_branding_segment(covers[-1], logo, out, fps, profile),
+            "cta": lambda out: main.create_cta_segment(covers[-1], "Link in Bio", logo, out, fps, profile),
+        }
+        for name, build in builders.items():
+            await self.measure(f"segment.{name}", lambda scratch, build=build: build(scratch / "segment.mp4"), cold=False)
+
+    async def run_inspix(self) -> None:
+        main = self.main
+        original = FIXTURES_DIR / ORIGINAL
+        results = [FIXTURES_DIR / name for name in RESULTS]
+
+        def render(engine: Callable[..., Awaitable[bool]]) -> Callable[[Path], Awaitable[bool]]:
+            return lambda scratch: engine(
+                original, results, scratch / "inspix.mp4",
+                logo_path=FIXTURES_DIR / LOGO, music_path=FIXTURES_DIR / MUSIC, profile=self.profile
+            )
+
+        await self.measure("inspix.segments_cold", render(main.create_inspix_video))
+        # Every segment served from the segment cache; only the final concat runs
+        await self.measure("inspix.segments_warm", render(main.create_inspix_video), cold=False, warmup=True)
+        await self.measure("inspix.single_pass", render(main.create_inspix_video_single_pass))
+        await self.measure("inspix.compositor", render(main.create_inspix_video_compositor))
+
+    async def run_slideshow(self) -> None:
+        main = self.main
+        images = [FIXTURES_DIR / name for name in RESULTS]
+
+        async def slideshow(scratch: Path) -> bool:
+            return await main.create_video_from_images(
+                images, scratch / "slideshow.mp4",
+                duration_per_image=3.0, transition_duration=1.0, fps=25,
+                text_content="Benchmark", second_text_content="Slideshow",
+                profile=main.DEFAULT_SLIDESHOW_PROFILE
+            )
+
+        await self.measure("slideshow.create_video_from_images", slideshow)
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        await self.main.probe_ffmpeg()
+        await self.main.open_http_session()
+        try:
+            await self.run_downloads()
+            await self.run_normalize()
+            await self.run_segments()
+            await self.run_inspix()
+            await self.run_slideshow()
+        finally:
+            await self.main.close_http_session()
+        return self.results
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Names and details of benchmarks slower than the baseline beyond tolerance"""
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            print(f"{name:<40} (not in baseline)")
+            continue
+        change = current["median"] / reference["median"] - 1 if reference["median"] else 0.0
+        slower = current["median"] - reference["median"]
+        marker = ""
+        if change > tolerance and slower > MIN_REGRESSION_SECONDS:
+            marker = "  REGRESSION"
+            regressions.append(f"{name}: {reference['median']:.3f}s -> {current['median']:.3f}s ({change:+.1%})")
+        print(f"{name:<40} {reference['median']:8.3f}s -> {current['median']:8.3f}s  {change:+7.1%}{marker}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the render and ingest hot paths")
+    parser.add_argument("--repeat", type=int, default=3, help="Iterations per benchmark (default 3)")
+    parser.add_argument("--profile", default=None, help="Render profile for the inspix benchmarks (default: server default)")
+    parser.add_argument("--only", action="append", default=[], help="Run benchmarks whose name contains this; repeatable")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results JSON and fail on regressions")
+    parser.add_argument("--save-baseline", type=Path, help="Write results JSON here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed median slowdown vs baseline (default 0.15 = 15%%)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the server's INFO logging")
+    args = parser.parse_args()
+
+    if not FIXTURES_DIR.is_dir():
+        print(f"Missing fixtures in {FIXTURES_DIR}; run benchmarks/make_fixtures.py", file=sys.stderr)
+        return 2
+
+    # main.py creates uploads/, outputs/ and cache/ relative to the working directory on import
+    workspace = Path(tempfile.mkdtemp(prefix="inspix-bench-"))
+    os.environ["CACHE_DIR"] = str(workspace / "cache")
+    os.chdir(workspace)
+    sys.path.insert(0, str(REPO_DIR))
+    import main as app_main
+    if not args.verbose:
+        app_main.logger.setLevel(logging.WARNING)
+
+    profile = args.profile or app_main.DEFAULT_RENDER_PROFILE
+    if profile not in app_main.RENDER_PROFILES:
+        print(f"Unknown profile {profile}; choose from {', '.join(app_main.RENDER_PROFILES)}", file=sys.stderr)
+        return 2
+
+    server = start_fixture_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        suite = Suite(app_main, base_url, workspace, profile, args.repeat, args.only)
+        benchmarks = asyncio.run(suite.run())
+    finally:
+        server.shutdown()
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": app_main.CPU_COUNT,
+            "ffmpeg": ffmpeg_version(),
+        },
+        "config": {"profile": profile, "repeat": args.repeat},
+        "benchmarks": benchmarks,
+    }
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(results, indent=2) + "\n")
+            print(f"Wrote {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("version") != RESULTS_VERSION:
+            print(f"Baseline {args.baseline} is results version {baseline.get('version')}, expected {RESULTS_VERSION}", file=sys.stderr)
+            return 2
+        if baseline["config"]["profile"] != profile:
+            print(f"Warning: baseline used the {baseline['config']['profile']} profile, this run {profile}")
+        if baseline["environment"].get("cpu_count") != results["environment"]["cpu_count"] or \
+                baseline["environment"].get("ffmpeg") != results["environment"]["ffmpeg"]:
+            print("Warning: baseline was recorded on a different machine or FFmpeg build")
+
+        print(f"\nComparison against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nPERFORMANCE REGRESSION in {len(regressions)} benchmark(s):", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print("\nNo regressions")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,17 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Header, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
 import subprocess
 import os
 import tempfile
 import shutil
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple, Callable, Tuple, AsyncIterator, Awaitable, BinaryIO
 import asyncio
+import anyio
 from pathlib import Path
 import logging
 import aiohttp
@@ -16,9 +19,21 @@ import aiofiles
 from urllib.parse import urlparse
 import mimetypes
 import json
-from PIL import Image
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+import numpy as np
 import re
 import gc
+import threading
+import time
+import math
+import functools
+import hashlib
+import hmac
+import struct
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from email.utils import formatdate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,8 +70,106 @@ MIN_IMAGE_DIMENSION = 720  # Higher minimum for better quality
 DOWNLOAD_TIMEOUT = 60  # seconds
 VIDEO_TIMEOUT = 180  # seconds for video processing (increased for higher quality)
 DOWNLOAD_CHUNK_SIZE = 8192  # Larger chunks for faster download
+UPLOAD_CHUNK_SIZE = 256 * 1024  # Read size when saving multipart uploads to disk
+IMAGE_HEADER_LIMIT = 256 * 1024  # Leading bytes of a download searched for image dimensions
+DOWNLOAD_CONCURRENCY = int(os.environ.get("DOWNLOAD_CONCURRENCY", 4))  # Parallel asset fetches per request
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", 100))  # Max open connections across all hosts
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 16))  # Max open connections per CDN host
+HTTP_DNS_CACHE_TTL = 300  # seconds
+HTTP_KEEPALIVE_TIMEOUT = 30  # seconds an idle pooled connection is kept open
+CACHE_DIR = Path(os.environ.get("CACHE_DIR", "cache"))
+DOWNLOAD_CACHE_DIR = CACHE_DIR / "downloads"
+DOWNLOAD_CACHE_MAX_BYTES = int(os.environ.get("DOWNLOAD_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024))  # 2GB of cached assets
+IMAGE_CACHE_DIR = CACHE_DIR / "images"
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 1024 * 1024 * 1024))  # 1GB of normalized images
+SEGMENT_CACHE_DIR = CACHE_DIR / "segments"
+SEGMENT_CACHE_MAX_BYTES = int(os.environ.get("SEGMENT_CACHE_MAX_BYTES", 1024 * 1024 * 1024))  # 1GB of rendered segments
+SEGMENT_CACHE_VERSION = 2  # Bump whenever a segment builder's filters change
+RESULT_CACHE_DIR = CACHE_DIR / "results"
+RESULT_CACHE_VERSION = 2  # Bump whenever the final mux or the single-pass graph changes
+FILE_HASH_MEMO_SIZE = int(os.environ.get("FILE_HASH_MEMO_SIZE", 4096))  # Content hashes remembered by file identity
+FFMPEG_STDERR_LIMIT = 64 * 1024  # Tail of FFmpeg stderr kept for error logs
+FFMPEG_STDOUT_LIMIT = 1024 * 1024  # Max captured stdout (ffprobe output)
+STREAM_CHUNK_SIZE = 64 * 1024  # Read size when streaming FFmpeg output to a client
+DOWNLOAD_SEND_CHUNK_SIZE = 256 * 1024  # Read size when serving /download bodies
+DOWNLOAD_MAX_AGE = int(os.environ.get("DOWNLOAD_MAX_AGE", 86400))  # Cache-Control max-age for rendered videos
+# When set (e.g. "/protected-outputs/"), /download answers with X-Accel-Redirect to this
+# nginx internal location and nginx serves the bytes from OUTPUT_DIR
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = os.environ.get("DOWNLOAD_ACCEL_REDIRECT_PREFIX")
+FFMPEG_MAX_PROCESSES = int(os.environ.get("FFMPEG_MAX_PROCESSES", 0))  # Concurrent FFmpeg children, 0 = one per available CPU
+FFMPEG_MAX_THREADS = int(os.environ.get("FFMPEG_MAX_THREADS", 0))  # Thread cap per FFmpeg process, 0 = all available CPUs
+FFMPEG_CPU_COUNT = int(os.environ.get("FFMPEG_CPU_COUNT", 0))  # Override for the detected CPU budget
+FFMPEG_STALL_TIMEOUT = int(os.environ.get("FFMPEG_STALL_TIMEOUT", 30))  # Kill an FFmpeg child whose progress stops for this long
+FFMPEG_WATCHDOG_INTERVAL = 1  # seconds between timeout/stall checks
+PROGRESS_POLL_INTERVAL = 0.5  # seconds between job progress events
+SSE_KEEPALIVE_INTERVAL = 15  # seconds between keep-alive comments on idle event streams
+OUTPUT_MAX_AGE = int(os.environ.get("OUTPUT_MAX_AGE", 7 * 86400))  # Delete outputs not downloaded for this long, 0 = keep forever
+OUTPUT_MAX_BYTES = int(os.environ.get("OUTPUT_MAX_BYTES", 20 * 1024 * 1024 * 1024))  # 20GB of outputs, 0 = no quota
+OUTPUT_MIN_AGE = 300  # seconds a new output is safe from quota eviction
+STALE_WORKSPACE_AGE = int(os.environ.get("STALE_WORKSPACE_AGE", 3600))  # Untouched scratch/request dirs older than this are leaked
+JANITOR_INTERVAL = int(os.environ.get("JANITOR_INTERVAL", 300))  # seconds between disk sweeps
+OUTPUT_PREFIXES = ("video_", "inspix_")  # Finished videos in OUTPUT_DIR
+SCRATCH_PREFIXES = ("segments_", "grid_temp_", "temp_")  # Per-render scratch files and dirs
+# Bold font for text overlays: FONT_PATH, else the first candidate that exists
+# (Arial Bold as originally designed, then the DejaVu fonts shipped in the Docker image)
+FONT_PATH = os.environ.get("FONT_PATH")
+FONT_CANDIDATES = [
+    "/Windows/Fonts/arialbd.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/usr/share/fonts/truetype/msttcorefonts/Arial_Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+]
+TRACKED_ENCODERS = ("libx264", "libx265", "libsvtav1", "aac")  # Reported by the capability registry
+TRACKED_FILTERS = ("drawtext", "xfade", "zoompan", "overlay")
+REQUIRED_ENCODERS = ("libx264", "aac")  # Renders are refused (503) without these
+REQUIRED_FILTERS = ("drawtext", "xfade", "overlay")
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")  # When set, /admin endpoints require a matching X-Admin-Token header
 VIDEO_WIDTH = 1080  # Full HD width
 VIDEO_HEIGHT = 1920  # Full HD height
+SEGMENT_TIMESCALE = 90000  # MP4 video track timescale shared by all segments
+
+# Render job queue configuration
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", 2))  # Concurrent background renders
+RENDER_QUEUE_SIZE = int(os.environ.get("RENDER_QUEUE_SIZE", 20))  # Max jobs waiting for a worker
+RENDER_JOB_HISTORY = 200  # Finished jobs kept for status lookups
+MAX_CONCURRENT_RENDERS = int(os.environ.get("MAX_CONCURRENT_RENDERS", 2))  # Renders in progress at once (requests + jobs)
+RENDER_WAIT_QUEUE_SIZE = int(os.environ.get("RENDER_WAIT_QUEUE_SIZE", 4))  # Requests allowed to wait for a render slot
+RENDER_TIME_WINDOW = 20  # Recent render durations averaged for Retry-After
+DEFAULT_RENDER_SECONDS = 60  # Retry-After basis before any render has finished
+
+# Inspix rendering engines: "segments" encodes each timeline segment and joins them,
+# "single_pass" compiles the whole timeline into one filter graph and encodes once,
+# "compositor" builds frames in Pillow/NumPy and pipes them into a single encoder
+RENDER_ENGINES = {"segments", "single_pass", "compositor"}
+DEFAULT_RENDER_ENGINE = os.environ.get("INSPIX_RENDER_ENGINE", "segments")
+# Compositor output frame rate: each static span is piped and encoded as one frame; "cfr" then
+# repeats it at the encoder to a constant fps (Instagram asks for constant frame rate),
+# "vfr" keeps one frame per static span
+INSPIX_FRAME_RATE_MODE = os.environ.get("INSPIX_FRAME_RATE_MODE", "cfr")
+
+# Job progress stages per engine, weighted roughly by their share of the render time
+PROGRESS_STAGES = {
+    "segments": {
+        "download": 2, "hook_grid": 1, "original_photo": 2, "prompt_tease": 2,
+        "results_showcase": 7, "branding": 2, "cta": 1, "final_concat": 1,
+    },
+    "single_pass": {"download": 2, "render": 15},
+    "compositor": {"download": 2, "render": 15},
+}
+
+# Named libx264 profiles trading encode speed against quality. keyint is the GOP length in
+# seconds; maxrate/bufsize cap the bitrate. "standard" is the original inspix encode.
+RENDER_PROFILES = {
+    "draft": {"preset": "veryfast", "crf": 28, "tune": "stillimage", "keyint": 2, "maxrate": "4M", "bufsize": "2M", "label": "Fast Preview"},
+    "standard": {"preset": "medium", "crf": 18, "tune": None, "keyint": 1, "maxrate": "8M", "bufsize": "2M", "label": "Near Lossless"},
+    "archive": {"preset": "slow", "crf": 14, "tune": "stillimage", "keyint": 1, "maxrate": "16M", "bufsize": "8M", "label": "Archival"},
+}
+DEFAULT_RENDER_PROFILE = os.environ.get("INSPIX_RENDER_PROFILE", "standard")
+DEFAULT_SLIDESHOW_PROFILE = os.environ.get("SLIDESHOW_RENDER_PROFILE", "draft")  # /create-video
 
 # Pydantic models for the new endpoint
 class VideoGenerationRequest(BaseModel):
@@ -67,6 +180,8 @@ class VideoGenerationRequest(BaseModel):
     logo_url: Optional[str] = None
     custom_cta_text: Optional[str] = "Link in Bio 👆"
     music_url: Optional[str] = None
+    render_engine: Optional[str] = None  # "segments", "single_pass" or "compositor", defaults to INSPIX_RENDER_ENGINE
+    render_profile: Optional[str] = None  # "draft", "standard" or "archive", defaults to INSPIX_RENDER_PROFILE
 
     class Config:
         json_schema_extra = {
@@ -86,19 +201,165 @@ class VideoGenerationRequest(BaseModel):
             }
         }
 
-def check_ffmpeg():
-    """Check if FFmpeg is available"""
-    try:
-        result = subprocess.run(
-            ["ffmpeg", "-version"],
-            capture_output=True,
-            text=True,
-            timeout=10
+# Prometheus metrics, served on /metrics
+DOWNLOAD_SECONDS = Histogram(
+    "inspix_download_seconds",
+    "Asset download latency, including cache revalidation",
+    ["asset_type", "cache"]
+)
+DOWNLOAD_BYTES = Histogram(
+    "inspix_download_bytes",
+    "Downloaded asset size",
+    ["asset_type"],
+    buckets=(16e3, 64e3, 256e3, 1e6, 2e6, 4e6, 8e6, 16e6, 64e6)
+)
+SEGMENT_SECONDS = Histogram(
+    "inspix_segment_seconds",
+    "Wall time per inspix segment builder and the final concat",
+    ["segment"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+)
+RENDER_SECONDS = Histogram(
+    "inspix_render_seconds",
+    "Total render time per video",
+    ["engine", "profile"],
+    buckets=(1, 2, 5, 10, 20, 30, 60, 90, 120, 180, 300)
+)
+FFMPEG_CPU_SECONDS = Histogram(
+    "ffmpeg_cpu_seconds",
+    "User plus system CPU time per FFmpeg invocation",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 40, 80, 160)
+)
+FFMPEG_PEAK_RSS_BYTES = Histogram(
+    "ffmpeg_peak_rss_bytes",
+    "Peak resident set size per FFmpeg invocation",
+    buckets=(32e6, 64e6, 128e6, 256e6, 512e6, 1e9, 2e9, 4e9)
+)
+FFMPEG_INVOCATIONS = Counter(
+    "ffmpeg_invocations",
+    "FFmpeg/ffprobe invocations by outcome",
+    ["outcome"]
+)
+
+def observe_download(asset_type: str, started: float, cached: Dict[str, Any]) -> None:
+    """Record latency and size of a successful asset fetch"""
+    DOWNLOAD_SECONDS.labels(asset_type=asset_type, cache=cached["cache"]).observe(time.monotonic() - started)
+    DOWNLOAD_BYTES.labels(asset_type=asset_type).observe(cached["size"])
+
+class FFmpegCapabilities:
+    """
+    What the installed FFmpeg can do, probed once at startup (and again via
+    POST /admin/ffmpeg/refresh) instead of spawning ffmpeg on every request:
+    version, encoders, filters and the font file drawtext should use.
+    """
+
+    def __init__(self):
+        self.available = False
+        self.version: Optional[str] = None
+        self.encoders: set = set()
+        self.filters: set = set()
+        self.fonts: Dict[str, Optional[str]] = {"bold": None}
+        self.probed_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @staticmethod
+    def list_names(flag: str) -> set:
+        """Names listed by `ffmpeg -encoders` / `ffmpeg -filters`: rows are "<flags> <name> ..." """
+        output = subprocess.run(
+            ["ffmpeg", "-hide_banner", flag],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+        names = set()
+        for line in output.splitlines():
+            fields = line.split()
+            # Legend rows read "<flags> = <meaning>"
+            if len(fields) >= 2 and fields[1] != "=" and re.fullmatch(r"[A-Z.|]+", fields[0]):
+                names.add(fields[1])
+        return names
+
+    @staticmethod
+    def resolve_font() -> Optional[str]:
+        for candidate in ([FONT_PATH] if FONT_PATH else []) + FONT_CANDIDATES:
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def probe(self) -> None:
+        """Run the probes (blocking; a few short-lived ffmpeg processes)"""
+        self.fonts = {"bold": self.resolve_font()}
+        try:
+            result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, timeout=10)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg -version exited with {result.returncode}")
+            self.version = result.stdout.split("\n", 1)[0].removeprefix("ffmpeg version ").split(" Copyright")[0].strip()
+            self.encoders = self.list_names("-encoders")
+            self.filters = self.list_names("-filters")
+            self.available = True
+            self.error = None
+        except Exception as e:
+            logger.error(f"FFmpeg probe failed: {e}")
+            self.available = False
+            self.error = str(e)
+        self.probed_at = time.time()
+
+        logger.info(
+            f"FFmpeg {self.version or 'unavailable'}: "
+            f"encoders {', '.join(name for name in TRACKED_ENCODERS if name in self.encoders) or 'none'}; "
+            f"filters {', '.join(name for name in TRACKED_FILTERS if name in self.filters) or 'none'}; "
+            f"font {self.fonts['bold'] or 'fontconfig default'}"
         )
-        return result.returncode == 0
-    except Exception as e:
-        logger.error(f"FFmpeg check failed: {e}")
-        return False
+        if self.available and self.missing():
+            logger.error(f"FFmpeg lacks required components: {', '.join(self.missing())}")
+
+    def has_encoder(self, name: str) -> bool:
+        return name in self.encoders
+
+    def has_filter(self, name: str) -> bool:
+        return name in self.filters
+
+    def missing(self) -> List[str]:
+        """Required encoders and filters this FFmpeg build does not have"""
+        return [name for name in REQUIRED_ENCODERS if not self.has_encoder(name)] + \
+            [name for name in REQUIRED_FILTERS if not self.has_filter(name)]
+
+    def usable(self) -> bool:
+        return self.available and not self.missing()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "version": self.version,
+            "encoders": {name: self.has_encoder(name) for name in TRACKED_ENCODERS},
+            "filters": {name: self.has_filter(name) for name in TRACKED_FILTERS},
+            "fonts": self.fonts,
+            "missing": self.missing() if self.available else [],
+            "probed_at": self.probed_at,
+            "error": self.error,
+        }
+
+ffmpeg_capabilities = FFmpegCapabilities()
+
+@app.on_event("startup")
+async def probe_ffmpeg():
+    """Probe FFmpeg once off the event loop"""
+    await asyncio.to_thread(ffmpeg_capabilities.probe)
+
+def require_ffmpeg() -> None:
+    """Refuse a render up front when FFmpeg is missing or lacks what the builders use"""
+    if not ffmpeg_capabilities.available:
+        raise HTTPException(status_code=503, detail="FFmpeg not available")
+    missing = ffmpeg_capabilities.missing()
+    if missing:
+        raise HTTPException(status_code=503, detail=f"FFmpeg build lacks: {', '.join(missing)}")
+
+def drawtext_font() -> str:
+    """drawtext option (with trailing separator) for the resolved bold font; empty falls back to fontconfig"""
+    font = ffmpeg_capabilities.fonts.get("bold")
+    if not font:
+        return ""
+    # Forward slashes work everywhere; a drive letter's colon must be escaped for the option parser
+    path = font.replace("\\", "/").replace(":", "\\:")
+    return f"fontfile='{path}':"
 
 def validate_file_size(file: UploadFile) -> bool:
     """Validate file size"""
@@ -114,18 +375,35 @@ def validate_audio_format(filename: str) -> bool:
     """Validate audio format"""
     return Path(filename).suffix.lower() in SUPPORTED_AUDIO_FORMATS
 
-async def save_upload_file(upload_file: UploadFile, destination: Path) -> None:
-    """Save uploaded file to destination"""
+async def save_upload_file(upload_file: UploadFile, destination: Path) -> Dict[str, Any]:
+    """
+    Copy an upload to destination in chunks with async writes, enforcing
+    MAX_FILE_SIZE as it goes and hashing on the fly. The hash is recorded so
+    the asset caches do not read the file back. Returns its size and sha256.
+    """
+    digest = hashlib.sha256()
+    total_size = 0
     try:
-        with open(destination, "wb") as buffer:
-            content = await upload_file.read()
-            if len(content) > MAX_FILE_SIZE:
-                raise HTTPException(status_code=413, detail="File too large")
-            buffer.write(content)
+        async with aiofiles.open(destination, "wb") as f:
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                total_size += len(chunk)
+                if total_size > MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail=f"File too large (max {MAX_FILE_SIZE} bytes): {upload_file.filename}")
+                digest.update(chunk)
+                await f.write(chunk)
+    except HTTPException:
+        destination.unlink(missing_ok=True)
+        raise
     except Exception as e:
+        destination.unlink(missing_ok=True)
         logger.error(f"Error saving file: {e}")
         raise HTTPException(status_code=500, detail="Failed to save file")
 
+    sha256 = digest.hexdigest()
+    remember_file_sha256(destination, sha256)
+    logger.info(f"Saved upload {upload_file.filename}: {destination} ({total_size} bytes)")
+    return {"size": total_size, "sha256": sha256}
+
 def validate_image_url(url: str) -> bool:
     """Validate image URL format"""
     try:
@@ -138,71 +416,462 @@ def validate_image_url(url: str) -> bool:
     except Exception:
         return False
 
-async def download_image_from_url(session: aiohttp.ClientSession, url: str, destination: Path, validate_dimensions: bool = False) -> Dict[str, Any]:
-    """Download image from URL and save to destination with enhanced validation"""
+def is_image_content_type(content_type: str) -> bool:
+    """Check whether a response content type is an image"""
+    return any(img_type in content_type for img_type in ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/bmp', 'image/webp', 'image/'])
+
+def is_audio_content_type(content_type: str) -> bool:
+    """Check whether a response content type is a supported audio format"""
+    return any(audio_type in content_type for audio_type in ['audio/mpeg', 'audio/mp3', 'audio/wav', 'audio/m4a', 'audio/aac', 'audio/ogg'])
+
+def parse_max_age(cache_control: str) -> Optional[int]:
+    """Extract max-age from a Cache-Control header, None when absent or not cacheable"""
+    directives = [part.strip().lower() for part in cache_control.split(",")]
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return int(directive.split("=", 1)[1])
+            except ValueError:
+                return None
+    return None
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hardlink a cached file into a request directory, copying across filesystems"""
+    if destination.exists():
+        destination.unlink()
     try:
-        logger.info(f"Downloading image from: {url}")
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+def unlink_paths(paths: List[Path]) -> None:
+    """Delete files, ignoring ones that are already gone"""
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+async def remove_directory(path: Path) -> None:
+    """Delete a scratch directory tree off the event loop; finishes even if the caller is cancelled"""
+    # run_in_executor submits right away, so a cancelled caller cannot stop the removal from starting
+    await asyncio.shield(asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, path, True))
+
+# JPEG start-of-frame markers (baseline, progressive, lossless...); C4, C8 and CC are not frames
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def parse_image_size(data: bytearray) -> Optional[Tuple[int, int]]:
+    """
+    (width, height) from the leading bytes of a JPEG, PNG, GIF, WebP or BMP
+    file. Returns None while more bytes are needed; raises ValueError when
+    the bytes are not one of those formats.
+    """
+    if len(data) < 12:
+        return None
+
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) < 24:
+            return None
+        if data[12:16] != b"IHDR":
+            raise ValueError("PNG without IHDR")
+        return struct.unpack_from(">II", data, 16)
+
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack_from("<HH", data, 6)
+
+    if data[:2] == b"BM":
+        if len(data) < 26:
+            return None
+        if struct.unpack_from("<I", data, 14)[0] == 12:  # OS/2 BITMAPCOREHEADER
+            return struct.unpack_from("<HH", data, 18)
+        width, height = struct.unpack_from("<ii", data, 18)
+        return width, abs(height)  # Negative height means top-down rows
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        if len(data) < 30:
+            return None
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack_from("<HH", data, 26)
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = struct.unpack_from("<I", data, 21)[0]
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        raise ValueError("Unknown WebP chunk")
+
+    if data[:2] == b"\xff\xd8":
+        # Walk the marker segments by their lengths until a start-of-frame
+        pos = 2
+        while True:
+            if len(data) < pos + 4:
+                return None
+            if data[pos] != 0xFF:
+                raise ValueError("Corrupt JPEG marker")
+            marker = data[pos + 1]
+            if marker == 0xFF:  # Fill byte
+                pos += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # Standalone markers
+                pos += 2
+                continue
+            if marker in (0xD9, 0xDA):
+                raise ValueError("JPEG without a frame header")
+            if marker in JPEG_SOF_MARKERS:
+                if len(data) < pos + 9:
+                    return None
+                height, width = struct.unpack_from(">HH", data, pos + 5)
+                return width, height
+            pos += 2 + struct.unpack_from(">H", data, pos + 2)[0]
+
+    raise ValueError("Unrecognized image format")
+
+class ImageHeaderProbe:
+    """Feeds download chunks to parse_image_size until the dimensions are known"""
+
+    def __init__(self, limit: int = IMAGE_HEADER_LIMIT):
+        self.limit = limit
+        self.buffer = bytearray()
+        self.size: Optional[Tuple[int, int]] = None
+        self.done = False
+
+    def feed(self, chunk: bytes) -> Optional[Tuple[int, int]]:
+        """Returns the dimensions once known; raises ValueError for an unknown header"""
+        if self.done:
+            return self.size
+        self.buffer += chunk
+        try:
+            self.size = parse_image_size(self.buffer)
+        except ValueError:
+            # Not a format the fast parser knows; a full decode will have to tell
+            self.done = True
+            self.buffer = bytearray()
+            raise
+        if self.size or len(self.buffer) >= self.limit:
+            # Found, or the header is too far in
+            self.done = True
+            self.buffer = bytearray()
+        return self.size
+
+def read_image_size(path: Path) -> Tuple[int, int]:
+    """Dimensions of an image file from its header, else a PIL open (blocking; run in a thread)"""
+    with open(path, "rb") as f:
+        header = bytearray(f.read(IMAGE_HEADER_LIMIT))
+    try:
+        size = parse_image_size(header)
+        if size:
+            return size
+    except ValueError:
+        pass
+    with Image.open(path) as img:
+        return img.size
+
+def image_size_error(width: int, height: int, min_dimension: int) -> Optional[str]:
+    if width < min_dimension or height < min_dimension:
+        return f"Image dimensions {width}x{height} below minimum {min_dimension}px"
+    return None
+
+class DownloadCache:
+    """
+    Content-addressed on-disk cache for downloaded assets.
+
+    Bodies are stored once under blobs/<sha256>; index/<sha256(url)>.json maps
+    a URL to its blob together with the ETag/Last-Modified validators used to
+    revalidate it with a conditional GET. Concurrent fetches of the same URL
+    share one download, and the least recently used entries are evicted once
+    the blobs exceed max_bytes.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.blob_dir = root / "blobs"
+        self.index_dir = root / "index"
+        self.max_bytes = max_bytes
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> None:
+        """Load the URL index from disk and drop partial downloads"""
+        for partial in self.blob_dir.glob("*.part"):
+            partial.unlink(missing_ok=True)
+        for index_file in self.index_dir.glob("*.json"):
+            try:
+                entry = json.loads(index_file.read_text())
+            except (OSError, ValueError):
+                index_file.unlink(missing_ok=True)
+                continue
+            if (self.blob_dir / entry["sha256"]).exists():
+                self.entries[index_file.stem] = entry
+            else:
+                index_file.unlink(missing_ok=True)
+        logger.info(f"Download cache loaded: {len(self.entries)} entries, {self.total_bytes()} bytes")
+
+    def total_bytes(self) -> int:
+        """Bytes used by distinct cached blobs"""
+        return sum({entry["sha256"]: entry["size"] for entry in self.entries.values()}.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["entries"] = len(self.entries)
+        stats["bytes"] = self.total_bytes()
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        accept: Callable[[str], bool],
+        label: str,
+        min_dimension: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the cached blob for a URL, downloading or revalidating it first.
+        Callers asking for a URL that is already being fetched wait on that fetch.
+
+        With min_dimension set (images), width and height are parsed from the
+        first bytes as they arrive; a body smaller than min_dimension is
+        abandoned without downloading the rest. Formats the header parser does
+        not know are downloaded in full and decoded by the caller.
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        while True:
+            task = self.inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._fetch(session, url, key, accept, label, min_dimension))
+                self.inflight[key] = task
+                task.add_done_callback(lambda _: self.inflight.pop(key, None))
+            else:
+                logger.info(f"Joining in-flight download of {url}")
+            # Shield so one cancelled caller does not abort the download for the others
+            result = await asyncio.shield(task)
+            if not result.get("truncated"):
+                break
+            # Another caller abandoned a body below its minimum size; it may still do for this one
+            error = image_size_error(result["width"], result["height"], min_dimension) if min_dimension else None
+            if error:
+                return {"success": False, "error": error}
+            logger.info(f"Fetching {url} again after a joined download was abandoned")
+
+        if result["success"] and not accept(result["content_type"]):
+            return {"success": False, "error": f"Invalid content type: {result['content_type']}"}
+        if result["success"] and min_dimension and result.get("width") is not None:
+            error = image_size_error(result["width"], result["height"], min_dimension)
+            if error:
+                return {"success": False, "error": error}
+        return result
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        key: str,
+        accept: Callable[[str], bool],
+        label: str,
+        min_dimension: Optional[int]
+    ) -> Dict[str, Any]:
+        entry = self.entries.get(key)
+        if entry and not (self.blob_dir / entry["sha256"]).exists():
+            entry = None
+
+        if entry and entry.get("expires", 0) > time.time():
+            self.stats["hits"] += 1
+            return await self._use(key, entry, "hit")
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)) as response:
+            max_age = parse_max_age(response.headers.get('cache-control', ''))
+
+            if response.status == 304 and entry:
+                self.stats["revalidated"] += 1
+                if max_age is not None:
+                    entry["expires"] = time.time() + max_age
+                return await self._use(key, entry, "revalidated")
 
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)) as response:
             if response.status != 200:
-                logger.error(f"Failed to download image: HTTP {response.status}")
+                logger.error(f"Failed to download {label.lower()}: HTTP {response.status}")
                 return {"success": False, "error": f"HTTP {response.status}"}
 
             # Check content type
             content_type = response.headers.get('content-type', '').lower()
-            if not any(img_type in content_type for img_type in ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/bmp', 'image/webp', 'image/']):
-                logger.error(f"Invalid content type: {content_type}")
+            if not accept(content_type):
+                logger.error(f"Invalid {label.lower()} content type: {content_type}")
                 return {"success": False, "error": f"Invalid content type: {content_type}"}
 
             # Check content length
             content_length = response.headers.get('content-length')
             if content_length and int(content_length) > MAX_FILE_SIZE:
-                logger.error(f"Image too large: {content_length} bytes")
-                return {"success": False, "error": f"Image too large: {content_length} bytes"}
-
-            # Download and save with smaller chunks for memory efficiency
-            async with aiofiles.open(destination, 'wb') as f:
-                total_size = 0
-                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
-                    total_size += len(chunk)
-                    if total_size > MAX_FILE_SIZE:
-                        logger.error(f"Image too large during download: {total_size} bytes")
-                        return {"success": False, "error": f"Image too large during download"}
-                    await f.write(chunk)
-
-            logger.info(f"Downloaded image: {destination} ({total_size} bytes)")
-
-            # Validate dimensions if requested
-            if validate_dimensions:
+                logger.error(f"{label} too large: {content_length} bytes")
+                return {"success": False, "error": f"{label} too large: {content_length} bytes"}
+
+            # Stream into a partial blob, hashing on the fly
+            partial = self.blob_dir / f"{key}.{uuid.uuid4().hex[:8]}.part"
+            digest = hashlib.sha256()
+            total_size = 0
+            header = ImageHeaderProbe() if min_dimension is not None else None
+            try:
+                async with aiofiles.open(partial, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        total_size += len(chunk)
+                        if total_size > MAX_FILE_SIZE:
+                            logger.error(f"{label} too large during download: {total_size} bytes")
+                            return {"success": False, "error": f"{label} too large during download"}
+                        if header and not header.done:
+                            try:
+                                size = header.feed(chunk)
+                            except ValueError as e:
+                                # Unknown to the fast parser (TIFF, HEIC...); decoded in full after the download
+                                logger.info(f"No header dimensions for {url}: {e}")
+                                size = None
+                            error = image_size_error(*size, min_dimension) if size and min_dimension else None
+                            if error:
+                                logger.error(f"Aborting download of {url} after {total_size} bytes: {error}")
+                                return {"success": False, "error": error, "truncated": True, "width": size[0], "height": size[1]}
+                        digest.update(chunk)
+                        await f.write(chunk)
+
+                sha256 = digest.hexdigest()
+                blob = self.blob_dir / sha256
+                if blob.exists():
+                    partial.unlink()
+                else:
+                    partial.rename(blob)
+            finally:
+                if partial.exists():
+                    partial.unlink()
+
+            self.stats["misses"] += 1
+            entry = {
+                "url": url,
+                "sha256": sha256,
+                "size": total_size,
+                "content_type": content_type,
+                "etag": response.headers.get('etag'),
+                "last_modified": response.headers.get('last-modified'),
+                "expires": time.time() + max_age if max_age is not None else 0,
+            }
+            if header and header.size:
+                entry["width"], entry["height"] = header.size
+
+        result = await self._use(key, entry, "miss")
+        if self.total_bytes() > self.max_bytes:
+            await asyncio.to_thread(unlink_paths, self.select_evictions())
+        return result
+
+    async def _use(self, key: str, entry: Dict[str, Any], status: str) -> Dict[str, Any]:
+        """Record an access, persist the index entry and describe the blob"""
+        entry["last_access"] = time.time()
+        self.entries[key] = entry
+        async with aiofiles.open(self.index_dir / f"{key}.json", 'w') as f:
+            await f.write(json.dumps(entry))
+        return {
+            "success": True,
+            "path": self.blob_dir / entry["sha256"],
+            "sha256": entry["sha256"],
+            "size": entry["size"],
+            "content_type": entry["content_type"],
+            "width": entry.get("width"),
+            "height": entry.get("height"),
+            "cache": status,
+        }
+
+    def select_evictions(self) -> List[Path]:
+        """
+        Drop least recently used URLs from the index until the distinct blobs
+        fit in max_bytes; returns the files to delete
+        """
+        blob_refs: Dict[str, int] = {}
+        for entry in self.entries.values():
+            blob_refs[entry["sha256"]] = blob_refs.get(entry["sha256"], 0) + 1
+
+        total = self.total_bytes()
+        doomed = []
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key in self.inflight:
+                continue
+            del self.entries[key]
+            doomed.append(self.index_dir / f"{key}.json")
+            blob_refs[entry["sha256"]] -= 1
+            if blob_refs[entry["sha256"]] == 0:
+                doomed.append(self.blob_dir / entry["sha256"])
+                total -= entry["size"]
+            logger.info(f"Evicting cached download: {entry['url']}")
+        return doomed
+
+download_cache = DownloadCache(DOWNLOAD_CACHE_DIR, DOWNLOAD_CACHE_MAX_BYTES)
+
+@app.on_event("startup")
+async def load_download_cache():
+    """Load the download cache index off the event loop"""
+    await asyncio.to_thread(download_cache.load)
+
+async def download_image_from_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    destination: Path,
+    validate_dimensions: bool = False,
+    asset_type: str = "image"
+) -> Dict[str, Any]:
+    """Download image from URL and save to destination with enhanced validation"""
+    try:
+        logger.info(f"Downloading image from: {url}")
+
+        started = time.monotonic()
+        cached = await download_cache.fetch(
+            session, url, accept=is_image_content_type, label="Image",
+            min_dimension=MIN_IMAGE_DIMENSION if validate_dimensions else 0
+        )
+        if not cached["success"]:
+            return cached
+        observe_download(asset_type, started, cached)
+
+        # Hardlink the cached blob into the request directory
+        link_or_copy(cached["path"], destination)
+        total_size = cached["size"]
+        content_type = cached["content_type"]
+        logger.info(f"Downloaded image: {destination} ({total_size} bytes, cache {cached['cache']})")
+
+        # Validate dimensions if requested; normally already parsed from the header during download
+        if validate_dimensions:
+            width, height = cached.get("width"), cached.get("height")
+            if width is None:
                 try:
-                    with Image.open(destination) as img:
-                        width, height = img.size
-                        logger.info(f"Image dimensions: {width}x{height}")
-
-                        if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
-                            logger.error(f"Image too small: {width}x{height} (min {MIN_IMAGE_DIMENSION}px)")
-                            return {
-                                "success": False,
-                                "error": f"Image dimensions {width}x{height} below minimum {MIN_IMAGE_DIMENSION}px"
-                            }
-
-                        return {
-                            "success": True,
-                            "width": width,
-                            "height": height,
-                            "size": total_size,
-                            "content_type": content_type
-                        }
+                    width, height = await asyncio.to_thread(read_image_size, destination)
                 except Exception as e:
                     logger.error(f"Error validating image dimensions: {e}")
                     return {"success": False, "error": f"Invalid image file: {str(e)}"}
+            logger.info(f"Image dimensions: {width}x{height}")
+
+            error = image_size_error(width, height, MIN_IMAGE_DIMENSION)
+            if error:
+                logger.error(f"Image too small: {width}x{height} (min {MIN_IMAGE_DIMENSION}px)")
+                return {"success": False, "error": error}
 
             return {
                 "success": True,
+                "width": width,
+                "height": height,
                 "size": total_size,
-                "content_type": content_type
+                "content_type": content_type,
+                "sha256": cached["sha256"]
             }
 
+        return {
+            "success": True,
+            "size": total_size,
+            "content_type": content_type,
+            "sha256": cached["sha256"]
+        }
+
     except asyncio.TimeoutError:
         logger.error(f"Timeout downloading image from {url}")
         return {"success": False, "error": "Download timeout"}
@@ -210,6 +879,76 @@ async def download_image_from_url(session: aiohttp.ClientSession, url: str, dest
         logger.error(f"Error downloading image from {url}: {e}")
         return {"success": False, "error": str(e)}
 
+# Process-wide HTTP client session so asset downloads reuse pooled keep-alive
+# connections and cached DNS lookups instead of new TCP+TLS handshakes per request
+http_session: Optional[aiohttp.ClientSession] = None
+http_pool_stats = {
+    "requests": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+}
+
+async def on_http_request_start(session, context, params) -> None:
+    http_pool_stats["requests"] += 1
+
+async def on_http_connection_create_end(session, context, params) -> None:
+    http_pool_stats["connections_created"] += 1
+
+async def on_http_connection_reuseconn(session, context, params) -> None:
+    http_pool_stats["connections_reused"] += 1
+
+async def on_http_dns_cache_hit(session, context, params) -> None:
+    http_pool_stats["dns_cache_hits"] += 1
+
+async def on_http_dns_cache_miss(session, context, params) -> None:
+    http_pool_stats["dns_cache_misses"] += 1
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create the shared client session with a tuned connection pool"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_http_request_start)
+    trace_config.on_connection_create_end.append(on_http_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_http_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(on_http_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(on_http_dns_cache_miss)
+
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use"""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = create_http_session()
+    return http_session
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Connection pool counters plus the keep-alive reuse rate"""
+    connections = http_pool_stats["connections_created"] + http_pool_stats["connections_reused"]
+    stats = dict(http_pool_stats)
+    stats["connection_reuse_rate"] = round(http_pool_stats["connections_reused"] / connections, 3) if connections else 0.0
+    return stats
+
+@app.on_event("startup")
+async def open_http_session():
+    """Open the shared HTTP client session"""
+    get_http_session()
+
+@app.on_event("shutdown")
+async def close_http_session():
+    """Close the shared HTTP client session and its pooled connections"""
+    global http_session
+    if http_session is not None:
+        await http_session.close()
+        http_session = None
+
 def get_image_extension_from_url(url: str, content_type: str = None) -> str:
     """Get appropriate image extension from URL or content type"""
     # Try to get extension from URL
@@ -240,40 +979,26 @@ def validate_audio_url(url: str) -> bool:
     except Exception:
         return False
 
-async def download_audio_from_url(session: aiohttp.ClientSession, url: str, destination: Path) -> bool:
+async def download_audio_from_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    destination: Path,
+    asset_type: str = "audio"
+) -> bool:
     """Download audio from URL and save to destination"""
     try:
         logger.info(f"Downloading audio from: {url}")
 
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
-            if response.status != 200:
-                logger.error(f"Failed to download audio: HTTP {response.status}")
-                return False
-
-            # Check content type
-            content_type = response.headers.get('content-type', '').lower()
-            if not any(audio_type in content_type for audio_type in ['audio/mpeg', 'audio/mp3', 'audio/wav', 'audio/m4a', 'audio/aac', 'audio/ogg']):
-                logger.error(f"Invalid audio content type: {content_type}")
-                return False
-
-            # Check content length
-            content_length = response.headers.get('content-length')
-            if content_length and int(content_length) > MAX_FILE_SIZE:
-                logger.error(f"Audio too large: {content_length} bytes")
-                return False
-
-            # Download and save with smaller chunks for memory efficiency
-            async with aiofiles.open(destination, 'wb') as f:
-                total_size = 0
-                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
-                    total_size += len(chunk)
-                    if total_size > MAX_FILE_SIZE:
-                        logger.error(f"Audio too large during download: {total_size} bytes")
-                        return False
-                    await f.write(chunk)
+        started = time.monotonic()
+        cached = await download_cache.fetch(session, url, accept=is_audio_content_type, label="Audio")
+        if not cached["success"]:
+            return False
+        observe_download(asset_type, started, cached)
 
-            logger.info(f"Downloaded audio: {destination} ({total_size} bytes)")
-            return True
+        # Hardlink the cached blob into the request directory
+        link_or_copy(cached["path"], destination)
+        logger.info(f"Downloaded audio: {destination} ({cached['size']} bytes, cache {cached['cache']})")
+        return True
 
     except Exception as e:
         logger.error(f"Error downloading audio from {url}: {e}")
@@ -297,6 +1022,537 @@ def get_audio_extension_from_url(url: str, content_type: str = None) -> str:
     # Default fallback
     return '.mp3'
 
+def read_cgroup_cpu_quota() -> Optional[float]:
+    """CPU limit imposed by the container's cgroup (v2 or v1), in CPUs, or None when unlimited"""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+def detect_cpu_count() -> int:
+    """CPUs this process may actually use: the affinity mask, capped by any cgroup quota"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+
+    quota = read_cgroup_cpu_quota()
+    if quota:
+        count = min(count, math.ceil(quota))
+    return max(1, count)
+
+class ThreadAllocator:
+    """
+    Splits the CPU budget between FFmpeg processes that run at the same time.
+    A process started on an idle box gets every core; later ones get an even
+    share of what is still free, down to one thread each once saturated.
+    """
+
+    def __init__(self, cpu_count: int, max_threads: int):
+        self.cpu_count = cpu_count
+        self.max_threads = max_threads
+        self.running = 0
+        self.allocated = 0
+        self.stats = {"allocations": 0, "threads_allocated": 0, "single_thread_allocations": 0}
+
+    def acquire(self) -> int:
+        share = self.cpu_count // (self.running + 1)
+        threads = max(1, min(share, self.cpu_count - self.allocated, self.max_threads))
+        self.running += 1
+        self.allocated += threads
+        self.stats["allocations"] += 1
+        self.stats["threads_allocated"] += threads
+        if threads == 1:
+            self.stats["single_thread_allocations"] += 1
+        return threads
+
+    def release(self, threads: int) -> None:
+        self.running -= 1
+        self.allocated -= threads
+
+    def get_stats(self) -> Dict[str, Any]:
+        allocations = self.stats["allocations"]
+        return {
+            "cpu_count": self.cpu_count,
+            "max_threads_per_process": self.max_threads,
+            "running_processes": self.running,
+            "allocated_threads": self.allocated,
+            **self.stats,
+            "average_threads": round(self.stats["threads_allocated"] / allocations, 2) if allocations else None,
+        }
+
+# Process-wide CPU budget shared by every FFmpeg invocation
+CPU_COUNT = FFMPEG_CPU_COUNT or detect_cpu_count()
+ffmpeg_slots = asyncio.Semaphore(FFMPEG_MAX_PROCESSES or CPU_COUNT)
+thread_allocator = ThreadAllocator(CPU_COUNT, FFMPEG_MAX_THREADS or CPU_COUNT)
+
+def with_thread_count(cmd: List[str], threads: int) -> List[str]:
+    """Insert the allocated codec and filter thread counts into an ffmpeg command (output path last)"""
+    if Path(cmd[0]).name != "ffmpeg":
+        return cmd
+    return (
+        cmd[:1]
+        + ["-filter_threads", str(threads), "-filter_complex_threads", str(threads)]
+        + cmd[1:-1]
+        + ["-threads", str(threads)]
+        + cmd[-1:]
+    )
+
+def with_benchmark(cmd: List[str]) -> List[str]:
+    """Ask ffmpeg to report its own CPU time and peak RSS on stderr (see record_ffmpeg_usage)"""
+    if Path(cmd[0]).name != "ffmpeg":
+        return cmd
+    return cmd[:1] + ["-benchmark"] + cmd[1:]
+
+def record_ffmpeg_usage(stderr: str, outcome: str) -> None:
+    """
+    Export per-invocation CPU seconds and peak RSS from ffmpeg's -benchmark
+    lines. asyncio reaps children with waitpid(), so their wait4() rusage is
+    not available to us; ffmpeg measures the same getrusage() figures itself.
+    """
+    FFMPEG_INVOCATIONS.labels(outcome=outcome).inc()
+
+    times = re.search(r"bench: utime=([\d.]+)s stime=([\d.]+)s", stderr)
+    if times:
+        FFMPEG_CPU_SECONDS.observe(float(times.group(1)) + float(times.group(2)))
+
+    rss = re.search(r"bench: maxrss=(\d+)\s*(?:KiB|kB)", stderr)
+    if rss:
+        FFMPEG_PEAK_RSS_BYTES.observe(int(rss.group(1)) * 1024)
+
+class FFmpegResult(NamedTuple):
+    """Outcome of a single FFmpeg/ffprobe invocation"""
+    returncode: int
+    stderr: str
+    stdout: str = ""
+    timed_out: bool = False
+
+async def read_stream_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """Drain a subprocess pipe, keeping only the last `limit` bytes"""
+    buffer = bytearray()
+    while True:
+        chunk = await stream.read(DOWNLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > limit:
+            del buffer[:len(buffer) - limit]
+    return bytes(buffer)
+
+class RenderProgress:
+    """
+    Percent-complete of one render job. Stages carry weights roughly
+    proportional to their share of the render time; FFmpeg -progress reports
+    move a stage forward and leaving its progress_stage() block completes it.
+    """
+
+    def __init__(self):
+        self.weights: Dict[str, float] = {}
+        self.fractions: Dict[str, float] = {}
+        self.details: Dict[str, Dict[str, Any]] = {}
+
+    def plan(self, weights: Dict[str, float]) -> None:
+        self.weights = dict(weights)
+        self.fractions = {stage: 0.0 for stage in weights}
+
+    def update(self, stage: str, fraction: Optional[float], detail: Dict[str, Any]) -> None:
+        self.details[stage] = detail
+        if fraction is not None and stage in self.fractions:
+            # A stage may run several FFmpeg children; only completion takes it to 100%
+            self.fractions[stage] = max(self.fractions[stage], min(fraction, 0.95))
+
+    def complete(self, stage: str) -> None:
+        if stage in self.fractions:
+            self.fractions[stage] = 1.0
+
+    def percent(self) -> float:
+        total = sum(self.weights.values())
+        if not total:
+            return 0.0
+        done = sum(weight * self.fractions[stage] for stage, weight in self.weights.items())
+        return round(100 * done / total, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "percent": self.percent(),
+            "stages": {
+                stage: {"percent": round(100 * self.fractions[stage], 1), **self.details.get(stage, {})}
+                for stage in self.weights
+            },
+        }
+
+# Progress tracker of the job running in the current task, and the stage being rendered
+render_progress_var: ContextVar[Optional[RenderProgress]] = ContextVar("render_progress", default=None)
+progress_stage_var: ContextVar[Optional[str]] = ContextVar("progress_stage", default=None)
+
+@contextmanager
+def progress_stage(stage: str):
+    """Attribute FFmpeg progress inside the block to `stage` and complete it on success"""
+    token = progress_stage_var.set(stage)
+    try:
+        yield
+        progress = render_progress_var.get()
+        if progress:
+            progress.complete(stage)
+    finally:
+        progress_stage_var.reset(token)
+
+def plan_render_progress(engine: str) -> None:
+    """Declare the stages of the current job's render, if it is being tracked"""
+    progress = render_progress_var.get()
+    if progress:
+        progress.plan(PROGRESS_STAGES[engine])
+
+def expected_output_seconds(cmd: List[str]) -> Optional[float]:
+    """Output duration implied by a command's last -t option, if any"""
+    for i in range(len(cmd) - 2, 0, -1):
+        if cmd[i] == "-t":
+            try:
+                return float(cmd[i + 1])
+            except ValueError:
+                return None
+    return None
+
+class FFmpegProgress:
+    """Follows the key=value blocks an FFmpeg child writes to its -progress pipe"""
+
+    def __init__(self, cmd: List[str]):
+        self.duration = expected_output_seconds(cmd)
+        self.values: Dict[str, str] = {}
+        self.out_time = 0.0
+        self.frame = 0
+        self.last_advance = time.monotonic()
+
+    def feed(self, line: str) -> None:
+        key, _, value = line.strip().partition("=")
+        if key != "progress":
+            self.values[key] = value
+            return
+
+        # End of a report block
+        try:
+            out_time = int(self.values.get("out_time_us", 0)) / 1_000_000
+            frame = int(self.values.get("frame", 0))
+        except ValueError:
+            return
+        if out_time > self.out_time or frame > self.frame:
+            self.last_advance = time.monotonic()
+        self.out_time = max(self.out_time, out_time)
+        self.frame = max(self.frame, frame)
+        self.report()
+
+    def report(self) -> None:
+        progress = render_progress_var.get()
+        stage = progress_stage_var.get()
+        if not progress or not stage:
+            return
+        fraction = self.out_time / self.duration if self.duration else None
+        progress.update(stage, fraction, {
+            "frame": self.frame,
+            "fps": self.values.get("fps"),
+            "speed": self.values.get("speed", "").strip() or None,
+            "out_time": round(self.out_time, 2),
+        })
+
+    async def follow(self, reader: asyncio.StreamReader) -> None:
+        async for line in reader:
+            self.feed(line.decode("utf-8", errors="replace"))
+
+async def open_progress_pipe() -> Tuple[int, asyncio.StreamReader, asyncio.BaseTransport]:
+    """Create a pipe for `-progress pipe:<fd>`; returns (child write fd, reader, transport)"""
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader()
+    try:
+        read_file = os.fdopen(read_fd, "rb", 0)
+    except BaseException:
+        os.close(read_fd)
+        os.close(write_fd)
+        raise
+    try:
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader),
+            read_file
+        )
+    except BaseException:
+        read_file.close()
+        os.close(write_fd)
+        raise
+    return write_fd, reader, transport
+
+async def kill_process(process: asyncio.subprocess.Process) -> None:
+    """Kill a child process and reap it"""
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+async def feed_stdin(process: asyncio.subprocess.Process, chunks: AsyncIterator[bytes]) -> None:
+    """Write chunks to a child's stdin, closing it afterwards so the child sees EOF"""
+    try:
+        async for chunk in chunks:
+            process.stdin.write(chunk)
+            await process.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # The child exited early; its return code and stderr say why
+    except Exception:
+        # Never let the child finish a truncated input as if it were complete
+        if process.returncode is None:
+            process.kill()
+        raise
+    finally:
+        process.stdin.close()
+
+async def run_ffmpeg(
+    cmd: List[str],
+    timeout: float,
+    capture_stdout: bool = False,
+    stdin: Optional[AsyncIterator[bytes]] = None
+) -> FFmpegResult:
+    """
+    Run an FFmpeg/ffprobe command as an asyncio subprocess so the event loop
+    keeps serving other requests. The child is killed on timeout or when the
+    calling task is cancelled; stderr is kept in a bounded tail buffer.
+    At most FFMPEG_MAX_PROCESSES children run at once across all requests,
+    each with a thread count from thread_allocator. Chunks from `stdin`, if
+    given, are written to the child's pipe:0.
+    """
+    async with ffmpeg_slots:
+        threads = thread_allocator.acquire()
+        try:
+            return await _run_ffmpeg_process(with_benchmark(with_thread_count(cmd, threads)), timeout, capture_stdout, stdin)
+        finally:
+            thread_allocator.release(threads)
+
+async def _run_ffmpeg_process(
+    cmd: List[str],
+    timeout: float,
+    capture_stdout: bool,
+    stdin: Optional[AsyncIterator[bytes]] = None
+) -> FFmpegResult:
+    # ffmpeg reports progress on a dedicated pipe; a child whose progress stops
+    # advancing for FFMPEG_STALL_TIMEOUT is killed instead of waiting out `timeout`
+    monitor = None
+    progress_fd = None
+    if Path(cmd[0]).name == "ffmpeg" and os.name == "posix":
+        progress_fd, progress_reader, progress_transport = await open_progress_pipe()
+        cmd = cmd[:1] + ["-progress", f"pipe:{progress_fd}"] + cmd[1:]
+        monitor = FFmpegProgress(cmd)
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            pass_fds=(progress_fd,) if monitor else (),
+        )
+    except BaseException:
+        if monitor:
+            progress_transport.close()  # Closes the read end
+        raise
+    finally:
+        if monitor:
+            os.close(progress_fd)  # The child holds its own copy
+
+    readers = [asyncio.create_task(read_stream_tail(process.stderr, FFMPEG_STDERR_LIMIT))]
+    if capture_stdout:
+        readers.append(asyncio.create_task(read_stream_tail(process.stdout, FFMPEG_STDOUT_LIMIT)))
+    if monitor:
+        readers.append(asyncio.create_task(monitor.follow(progress_reader)))
+    feeder = asyncio.create_task(feed_stdin(process, stdin)) if stdin else None
+    if feeder:
+        readers.append(feeder)
+
+    failure = None
+    waiter = asyncio.ensure_future(process.wait())
+    deadline = time.monotonic() + timeout
+    try:
+        while not waiter.done():
+            await asyncio.wait({waiter}, timeout=FFMPEG_WATCHDOG_INTERVAL)
+            if waiter.done():
+                break
+            if time.monotonic() >= deadline:
+                failure = f"timed out after {timeout}s"
+            elif monitor and time.monotonic() - monitor.last_advance > FFMPEG_STALL_TIMEOUT:
+                failure = f"stalled, no progress for {FFMPEG_STALL_TIMEOUT}s"
+            if failure:
+                logger.error(f"{cmd[0]} {failure}, killing pid {process.pid}")
+                await kill_process(process)
+                break
+    except asyncio.CancelledError:
+        logger.warning(f"{cmd[0]} cancelled, killing pid {process.pid}")
+        FFMPEG_INVOCATIONS.labels(outcome="cancelled").inc()
+        waiter.cancel()
+        await kill_process(process)
+        for reader in readers:
+            reader.cancel()
+        raise
+    finally:
+        if monitor:
+            progress_transport.close()
+
+    outputs = await asyncio.gather(*readers, return_exceptions=True)
+    stderr = outputs[0].decode("utf-8", errors="replace") if isinstance(outputs[0], bytes) else ""
+    stdout = outputs[1].decode("utf-8", errors="replace") if capture_stdout and isinstance(outputs[1], bytes) else ""
+    if feeder and isinstance(outputs[-1], Exception):
+        logger.error(f"{cmd[0]} input failed: {outputs[-1]!r}")
+        stderr += f"\n[input failed: {outputs[-1]!r}]"
+
+    if failure:
+        record_ffmpeg_usage(stderr, "stalled" if failure.startswith("stalled") else "timeout")
+        stderr += f"\n[{failure}]"
+        return FFmpegResult(returncode=-1, stderr=stderr, stdout=stdout, timed_out=True)
+
+    record_ffmpeg_usage(stderr, "success" if process.returncode == 0 else "failed")
+    return FFmpegResult(returncode=process.returncode, stderr=stderr, stdout=stdout)
+
+async def stream_ffmpeg(cmd: List[str], timeout: float) -> AsyncIterator[bytes]:
+    """
+    Run an FFmpeg command that writes its output to pipe:1 and yield stdout
+    chunks as they are produced. Closing the generator early (e.g. the client
+    disconnected) kills the child; it shares the FFMPEG_MAX_PROCESSES budget
+    and thread allocation with run_ffmpeg.
+    """
+    async with ffmpeg_slots:
+        threads = thread_allocator.acquire()
+        chunks = _stream_ffmpeg_process(with_benchmark(with_thread_count(cmd, threads)), timeout)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+            thread_allocator.release(threads)
+
+async def _stream_ffmpeg_process(cmd: List[str], timeout: float) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_reader = asyncio.create_task(read_stream_tail(process.stderr, FFMPEG_STDERR_LIMIT))
+    deadline = loop.time() + timeout
+
+    try:
+        while True:
+            chunk = await asyncio.wait_for(
+                process.stdout.read(STREAM_CHUNK_SIZE),
+                timeout=max(deadline - loop.time(), 0)
+            )
+            if not chunk:
+                break
+            yield chunk
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            logger.warning(f"{cmd[0]} stream closed early, killing pid {process.pid}")
+            stderr_reader.cancel()
+            FFMPEG_INVOCATIONS.labels(outcome="cancelled").inc()
+            await kill_process(process)
+        else:
+            stderr = (await stderr_reader).decode("utf-8", errors="replace")
+            record_ffmpeg_usage(stderr, "success" if process.returncode == 0 else "failed")
+            if process.returncode != 0:
+                logger.error(f"Streaming FFmpeg exited with {process.returncode}: {stderr}")
+
+def fragmented_mp4_output() -> list:
+    """Output args for a fragmented MP4 written to stdout, playable while it is still being encoded"""
+    return [
+        "-movflags", "frag_keyframe+empty_moov+default_base_moof",
+        "-f", "mp4",
+        "pipe:1",
+    ]
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that always awaits `on_close` once it has been sent or
+    abandoned. The body generator's own finally does not run when the client
+    is gone before Starlette first iterates it, so cleanup cannot live there.
+    """
+
+    def __init__(self, content: AsyncIterator[bytes], on_close: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.on_close()
+
+async def streaming_video_response(
+    cmd: List[str],
+    timeout: float,
+    filename: str,
+    cleanup: Callable[[], Awaitable[None]],
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """
+    Start a streaming FFmpeg command and return a response that relays its
+    output. The first chunk is awaited up front so an FFmpeg failure can still
+    be reported as a 500. `cleanup` (e.g. releasing the render slot) runs
+    exactly once, when the stream finishes or the client goes away, even if
+    the body was never started.
+    """
+    chunks = stream_ffmpeg(cmd, timeout)
+    try:
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        await cleanup()
+        raise HTTPException(status_code=500, detail="Failed to generate video")
+    except BaseException:
+        await chunks.aclose()
+        await cleanup()
+        raise
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    body_chunks = body()
+
+    async def close() -> None:
+        # The response closes the FFmpeg stream (killing and reaping the child) itself
+        try:
+            await body_chunks.aclose()
+            await chunks.aclose()
+        finally:
+            await cleanup()
+
+    return ClosingStreamingResponse(
+        body_chunks,
+        close,
+        media_type="video/mp4",
+        headers={
+            "Content-Disposition": f'inline; filename="{filename}"',
+            **(headers or {})
+        }
+    )
+
+async def gather_or_cancel(*aws) -> list:
+    """Run awaitables concurrently; on the first failure cancel the rest and re-raise"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 def escape_ffmpeg_text(text: str) -> str:
     """Escape special characters for FFmpeg drawtext filter"""
     # Replace special characters that need escaping in FFmpeg
@@ -308,14 +1564,56 @@ def escape_ffmpeg_text(text: str) -> str:
     text = text.replace("]", "\\]")
     return text
 
-def get_high_quality_ffmpeg_flags() -> list:
+def get_high_quality_ffmpeg_flags(profile: str = "standard") -> list:
     """Get FFmpeg flags optimized for high quality output"""
+    settings = RENDER_PROFILES[profile]
     return [
         "-max_muxing_queue_size", "1024",  # Larger muxing queue for quality
-        "-bufsize", "2M",  # Larger buffer size
-        "-maxrate", "8M",  # Higher bitrate for better quality
+        "-bufsize", settings["bufsize"],  # Larger buffer size
+        "-maxrate", settings["maxrate"],  # Bitrate cap for the profile
     ]
 
+def get_profile_encoding_flags(fps: int, profile: str = "standard") -> list:
+    """libx264 speed/quality flags for a named render profile"""
+    settings = RENDER_PROFILES[profile]
+    flags = [
+        "-preset", settings["preset"],
+        "-crf", str(settings["crf"]),
+    ]
+    if settings["tune"]:
+        flags += ["-tune", settings["tune"]]
+    return flags + ["-g", str(settings["keyint"] * fps)]
+
+def get_segment_encoding_flags(fps: int, profile: str = "standard") -> list:
+    """
+    Encoding contract shared by every inspix segment builder. Identical codec
+    parameters (profile, level, SPS/PPS, fps, timebase, closed fixed-length
+    GOPs) let the final join stream-copy the segments instead of re-encoding,
+    so every segment of a video must use the same profile.
+    """
+    return [
+        "-c:v", "libx264",
+        "-pix_fmt", "yuv420p",
+        "-profile:v", "high",
+        "-level", "4.1",
+    ] + get_profile_encoding_flags(fps, profile) + [
+        "-r", str(fps),
+        "-keyint_min", str(RENDER_PROFILES[profile]["keyint"] * fps),  # Fixed-length GOPs
+        "-sc_threshold", "0",  # No scene-cut keyframes, so every segment has the same GOP layout
+        "-flags", "+cgop",  # Closed GOPs so each segment decodes on its own
+        "-aspect", "9:16",  # Square pixels
+        "-color_range", "tv",
+        "-video_track_timescale", str(SEGMENT_TIMESCALE),
+        "-an",
+    ]
+
+def showcase_clip_duration(result_count: int, total_duration: float = 7.0, transition_duration: float = 0.5) -> float:
+    """
+    Length of each results-showcase clip. Neighbouring clips overlap by the
+    xfade transition, so each is stretched to keep the showcase at total_duration.
+    """
+    return (total_duration + (result_count - 1) * transition_duration) / result_count
+
 def auto_generate_prompt_preview(result_count: int) -> str:
     """Auto-generate prompt preview text if not provided"""
     prompts = [
@@ -326,10 +1624,275 @@ def auto_generate_prompt_preview(result_count: int) -> str:
     ]
     return prompts[min(result_count - 1, len(prompts) - 1)] if result_count > 0 else prompts[0]
 
-def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30) -> bool:
+# LRU memo of content hashes keyed by file identity, so hardlinked cache blobs are hashed once.
+# Filled from worker threads, hence the lock.
+file_hashes: "OrderedDict[tuple, str]" = OrderedDict()
+file_hashes_lock = threading.Lock()
+
+def file_identity(path: Path) -> tuple:
+    stat = path.stat()
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+def remember_hash(identity: tuple, sha256: str) -> None:
+    with file_hashes_lock:
+        file_hashes[identity] = sha256
+        file_hashes.move_to_end(identity)
+        while len(file_hashes) > FILE_HASH_MEMO_SIZE:
+            file_hashes.popitem(last=False)
+
+def compute_file_sha256(path: Path) -> str:
+    """Hash a file's content (blocking; run in a thread)"""
+    identity = file_identity(path)
+    with file_hashes_lock:
+        if identity in file_hashes:
+            file_hashes.move_to_end(identity)
+            return file_hashes[identity]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    remember_hash(identity, digest.hexdigest())
+    return digest.hexdigest()
+
+def remember_file_sha256(path: Path, sha256: str) -> None:
+    """Record a hash computed while the file was written, so file_sha256 need not read it"""
+    remember_hash(file_identity(path), sha256)
+
+async def file_sha256(path: Path) -> str:
+    """Content hash of a file, computed off the event loop"""
+    return await asyncio.to_thread(compute_file_sha256, path)
+
+def evict_lru_files(directory: Path, max_bytes: int) -> None:
+    """Delete least recently used files (by mtime, touched on every hit) until the directory fits max_bytes"""
+    files = []
+    for path in directory.iterdir():
+        if not path.is_file() or ".part" in path.suffixes:
+            continue  # Skip scratch directories and files still being written
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        logger.info(f"Evicted cached file: {path.name}")
+
+# Canonical pre-scaled intermediates: (width, height, fit) where "cover" scales to fill and
+# center-crops, "letterbox" scales to fit and pads with black, and "grid" is the hook grid
+# cell (scaled to cover 1.1x the cell, then center-cropped to the cell size)
+IMAGE_VARIANTS = {
+    "cover": (VIDEO_WIDTH, VIDEO_HEIGHT, "cover"),
+    "letterbox": (VIDEO_WIDTH, VIDEO_HEIGHT, "letterbox"),
+    "grid": (540, 960, "grid"),
+}
+
+def render_image_variants(source: Path, targets: Dict[str, Path]) -> None:
+    """Decode a source image once and write each requested variant (blocking; run in a thread)"""
+    with Image.open(source) as img:
+        # Let the JPEG decoder downscale by a power of two while still covering the full frame
+        ratio = max(VIDEO_WIDTH / img.width, VIDEO_HEIGHT / img.height)
+        if ratio < 1:
+            img.draft("RGB", (math.ceil(img.width * ratio), math.ceil(img.height * ratio)))
+        img = img.convert("RGB")
+
+        for variant, destination in targets.items():
+            width, height, fit = IMAGE_VARIANTS[variant]
+            if fit == "letterbox":
+                ratio = min(width / img.width, height / img.height)
+                scaled = img.resize((max(1, round(img.width * ratio)), max(1, round(img.height * ratio))), Image.LANCZOS)
+                canvas = Image.new("RGB", (width, height), "black")
+                canvas.paste(scaled, ((width - scaled.width) // 2, (height - scaled.height) // 2))
+            else:
+                zoom = 1.1 if fit == "grid" else 1.0
+                ratio = max(width * zoom / img.width, height * zoom / img.height)
+                scaled = img.resize((max(width, round(img.width * ratio)), max(height, round(img.height * ratio))), Image.LANCZOS)
+                left = (scaled.width - width) // 2
+                top = (scaled.height - height) // 2
+                canvas = scaled.crop((left, top, left + width, top + height))
+
+            partial = destination.with_name(f"{destination.name}.{uuid.uuid4().hex[:8]}.part")
+            canvas.save(partial, format="PNG", compress_level=1)
+            os.replace(partial, destination)
+
+class ImageVariantCache:
+    """
+    Content-addressed cache of normalized source images. Each source is
+    decoded once into the canonical variants the segment builders need, stored
+    as <sha256>_<variant>.png, and shared by every request using that content.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, sha256: str, variant: str) -> Path:
+        width, height, _ = IMAGE_VARIANTS[variant]
+        return self.directory / f"{sha256}_{variant}_{width}x{height}.png"
+
+    async def get(self, source: Path, variants: List[str], workspace: Path) -> Dict[str, Path]:
+        """Return the requested variants of a source image, hardlinked into workspace"""
+        sha256 = await file_sha256(source)
+        key = f"{sha256}:{','.join(sorted(variants))}"
+        # Link into the request workspace so eviction cannot pull files out from under a render
+        linked = {variant: workspace / f"{sha256[:16]}_{variant}.png" for variant in variants}
+
+        # A concurrent eviction may delete a variant between any check and the link;
+        # a variant that disappears is treated as a miss and normalized again
+        while True:
+            task = self.inflight.get(key)
+            if task is None:
+                # The normalizing caller's own copies are linked before eviction runs
+                task = asyncio.ensure_future(self._materialize(source, sha256, variants, linked))
+                self.inflight[key] = task
+                task.add_done_callback(lambda _: self.inflight.pop(key, None))
+                return await asyncio.shield(task)
+
+            await asyncio.shield(task)
+            try:
+                for variant in variants:
+                    link_or_copy(self.path_for(sha256, variant), linked[variant])
+                return linked
+            except FileNotFoundError:
+                logger.info(f"Variants of {source.name} were evicted before they could be reused")
+
+    async def _materialize(self, source: Path, sha256: str, variants: List[str], linked: Dict[str, Path]) -> Dict[str, Path]:
+        paths = {variant: self.path_for(sha256, variant) for variant in variants}
+        normalized = False
+        while True:
+            missing = {}
+            for variant, path in paths.items():
+                try:
+                    os.utime(path)  # Mark as recently used
+                except FileNotFoundError:
+                    missing[variant] = path
+
+            if missing:
+                logger.info(f"Normalizing {source.name} into {', '.join(missing)}")
+                await asyncio.to_thread(render_image_variants, source, missing)
+                normalized = True
+
+            try:
+                for variant, path in paths.items():
+                    link_or_copy(path, linked[variant])
+                break
+            except FileNotFoundError:
+                logger.info(f"Variants of {source.name} were evicted before they could be linked")
+
+        if normalized:
+            await asyncio.to_thread(evict_lru_files, self.directory, self.max_bytes)
+        return linked
+
+image_variant_cache = ImageVariantCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
+
+class SegmentCache:
+    """
+    Cache of rendered timeline segments keyed by a hash of the input content,
+    the builder parameters and the segment encoding contract. Concurrent
+    requests for the same segment share one render; files are evicted LRU
+    once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def segment_key(self, name: str, inputs: List[Optional[Path]], params: Dict[str, Any], fps: int, profile: str) -> str:
+        input_hashes = [
+            await file_sha256(path) if path and path.exists() else None
+            for path in inputs
+        ]
+        payload = {
+            "version": SEGMENT_CACHE_VERSION,
+            "segment": name,
+            "inputs": input_hashes,
+            "params": params,
+            "fps": fps,
+            "encoding": get_segment_encoding_flags(fps, profile) + get_high_quality_ffmpeg_flags(profile),
+            "font": drawtext_font(),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def render(
+        self,
+        name: str,
+        inputs: List[Optional[Path]],
+        params: Dict[str, Any],
+        fps: int,
+        profile: str,
+        output_path: Path,
+        build: Callable[[Path], Any]
+    ) -> bool:
+        """
+        Place the segment at output_path, reusing a cached render when one
+        exists. `build(path)` returns the builder coroutine for a cache miss.
+        """
+        key = await self.segment_key(name, inputs, params, fps, profile)
+        cached = self.directory / f"{key}.mp4"
+
+        # A concurrent build's eviction may delete the file between any check and the
+        # link; a segment that disappears is treated as a miss and rendered again
+        while True:
+            if cached.exists():
+                try:
+                    os.utime(cached)  # Mark as recently used
+                    link_or_copy(cached, output_path)
+                except FileNotFoundError:
+                    logger.info(f"Segment {name} was evicted before it could be reused")
+                else:
+                    self.stats["hits"] += 1
+                    logger.info(f"Segment cache hit: {name}")
+                    return True
+
+            task = self.inflight.get(key)
+            if task is None:
+                self.stats["misses"] += 1
+                # The builder's own copy is linked before eviction runs
+                task = asyncio.ensure_future(self._build(key, cached, build, output_path))
+                self.inflight[key] = task
+                task.add_done_callback(lambda _: self.inflight.pop(key, None))
+                return await asyncio.shield(task)
+
+            logger.info(f"Joining in-flight render of segment: {name}")
+            if not await asyncio.shield(task):
+                return False
+            try:
+                link_or_copy(cached, output_path)
+                return True
+            except FileNotFoundError:
+                logger.info(f"Segment {name} was evicted before it could be reused")
+
+    async def _build(self, key: str, cached: Path, build: Callable[[Path], Any], output_path: Path) -> bool:
+        partial = self.directory / f"{key}.{uuid.uuid4().hex[:8]}.part.mp4"
+        try:
+            if not await build(partial):
+                return False
+            os.replace(partial, cached)
+        finally:
+            partial.unlink(missing_ok=True)
+        link_or_copy(cached, output_path)
+        await asyncio.to_thread(evict_lru_files, self.directory, self.max_bytes)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+segment_cache = SegmentCache(SEGMENT_CACHE_DIR, SEGMENT_CACHE_MAX_BYTES)
+
+async def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30, prescaled: bool = False, profile: str = "standard") -> bool:
     """
     [0-1s] Hook Grid: Create 2x2 grid from first 4 result images
     Each cell: 540x960px, Quick zoom on each (0.25s per image)
+    With prescaled=True the images are already normalized 540x960 "grid" cells.
     """
     try:
         logger.info("Creating hook grid segment [0-1s]")
@@ -344,19 +1907,19 @@ def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30
         temp_dir.mkdir(exist_ok=True)
 
         try:
-            # Create individual videos for each grid cell with zoom effect
-            cell_videos = []
-            for i, img_path in enumerate(grid_images):
-                cell_video = temp_dir / f"cell_{i}.mp4"
-                cell_videos.append(cell_video)
+            # Render the grid cells concurrently, each with its zoom effect
+            cell_videos = [temp_dir / f"cell_{i}.mp4" for i in range(len(grid_images))]
 
+            async def render_cell(i: int, img_path: Path, cell_video: Path) -> None:
                 # Full HD resolution: 1080x1920 grid cells = 540x960 each
                 video_filter = (
                     f"scale=594:1056:force_original_aspect_ratio=increase,"  # Scale to 1.1x size
                     f"crop=540:960"  # Crop to cell size (1080/2 x 1920/2)
                 )
+                if prescaled:
+                    video_filter = "null"  # Already a normalized grid cell
 
-                memory_flags = get_high_quality_ffmpeg_flags()
+                memory_flags = get_high_quality_ffmpeg_flags(profile)
 
                 cmd = [
                     "ffmpeg", "-y",
@@ -364,26 +1927,20 @@ def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30
                     "-t", "1",
                     "-i", str(img_path),
                     "-vf", video_filter,
-                    "-c:v", "libx264",
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "medium",
-                    "-crf", "18",  # Near lossless quality
-                    "-r", str(fps),
-                    "-threads", "1",  # Reduced from 2
-                ] + memory_flags + [
+                ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
                     str(cell_video)
                 ]
 
                 logger.info(f"Creating grid cell {i+1}/4")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                result = await run_ffmpeg(cmd, timeout=30)
 
                 if result.returncode != 0:
-                    logger.error(f"Cell {i} creation failed: {result.stderr}")
-                    return False
+                    raise Exception(f"Cell {i} creation failed: {result.stderr}")
 
-                # Force cleanup of input image from memory after processing
-                del img_path
-                gc.collect()
+            await gather_or_cancel(*[
+                render_cell(i, img_path, cell_video)
+                for i, (img_path, cell_video) in enumerate(zip(grid_images, cell_videos))
+            ])
 
             # Force garbage collection after creating cells
             gc.collect()
@@ -395,7 +1952,7 @@ def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30
                 f"[top][bottom]vstack=inputs=2[v]"
             )
 
-            memory_flags = get_high_quality_ffmpeg_flags()
+            memory_flags = get_high_quality_ffmpeg_flags(profile)
 
             cmd = [
                 "ffmpeg", "-y",
@@ -405,19 +1962,14 @@ def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30
                 "-i", str(cell_videos[3]),
                 "-filter_complex", filter_complex,
                 "-map", "[v]",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-preset", "medium",
-                "-crf", "18",
-                "-r", str(fps),
+            ] + get_segment_encoding_flags(fps, profile) + [
                 "-t", "1",
-                "-threads", "1",
             ] + memory_flags + [
                 str(output_path)
             ]
 
             logger.info(f"Combining grid cells into 2x2 layout")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = await run_ffmpeg(cmd, timeout=60)
 
             if result.returncode != 0:
                 logger.error(f"Grid combination failed: {result.stderr}")
@@ -434,14 +1986,14 @@ def create_hook_grid(result_images: List[Path], output_path: Path, fps: int = 30
 
         finally:
             # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            await remove_directory(temp_dir)
             gc.collect()
 
     except Exception as e:
         logger.error(f"Error creating hook grid: {e}")
         return False
 
-def create_original_photo_segment(original_image: Path, output_path: Path, fps: int = 30) -> bool:
+async def create_original_photo_segment(original_image: Path, output_path: Path, fps: int = 30, profile: str = "standard") -> bool:
     """
     [1-3s] Original Photo: Display original centered, scale to 70% screen height
     Text overlay: "This Photo +", Zoom animation (1.0 → 1.08)
@@ -457,12 +2009,12 @@ def create_original_photo_segment(original_image: Path, output_path: Path, fps:
             f"pad={VIDEO_WIDTH}:{VIDEO_HEIGHT}:(ow-iw)/2:(oh-ih)/2:black,"
             f"fade=t=in:st=0:d=0.5,"
             f"drawtext=text='{text}':"
-            f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=80:fontcolor=white:"
+            f"{drawtext_font()}fontsize=80:fontcolor=white:"
             f"borderw=4:bordercolor=black:"
             f"x=(w-text_w)/2:y=(h-text_h)/2+300"
         )
 
-        memory_flags = get_high_quality_ffmpeg_flags()
+        memory_flags = get_high_quality_ffmpeg_flags(profile)
 
         cmd = [
             "ffmpeg", "-y",
@@ -470,18 +2022,12 @@ def create_original_photo_segment(original_image: Path, output_path: Path, fps:
             "-t", "2",
             "-i", str(original_image),
             "-vf", video_filter,
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
-            "-preset", "medium",
-            "-crf", "18",
-            "-r", str(fps),
-            "-threads", "1",
-        ] + memory_flags + [
+        ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
             str(output_path)
         ]
 
         logger.info(f"Running original photo FFmpeg command")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = await run_ffmpeg(cmd, timeout=60)
 
         if result.returncode != 0:
             logger.error(f"Original photo segment failed: {result.stderr}")
@@ -494,7 +2040,7 @@ def create_original_photo_segment(original_image: Path, output_path: Path, fps:
         logger.error(f"Error creating original photo segment: {e}")
         return False
 
-def create_prompt_tease_segment(original_image: Path, prompt_text: str, output_path: Path, fps: int = 30) -> bool:
+async def create_prompt_tease_segment(original_image: Path, prompt_text: str, output_path: Path, fps: int = 30, profile: str = "standard") -> bool:
     """
     [3-5s] Prompt Tease: Keep original visible (dimmed 30%)
     Text: "+ inspix Prompt =", Show prompt_preview_text (blurred, 48pt)
@@ -511,16 +2057,16 @@ def create_prompt_tease_segment(original_image: Path, prompt_text: str, output_p
             f"pad={VIDEO_WIDTH}:{VIDEO_HEIGHT}:(ow-iw)/2:(oh-ih)/2:black,"
             f"eq=brightness=-0.3,"
             f"drawtext=text='{text1}':"
-            f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=64:fontcolor=white:"
+            f"{drawtext_font()}fontsize=64:fontcolor=white:"
             f"borderw=3:bordercolor=black:"
             f"x=(w-text_w)/2:y=(h)/2-105,"
             f"drawtext=text='{text2}':"
-            f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=48:fontcolor=white:"
+            f"{drawtext_font()}fontsize=48:fontcolor=white:"
             f"borderw=3:bordercolor=black:"
             f"x=(w-text_w)/2:y=(h)/2+52"
         )
 
-        memory_flags = get_high_quality_ffmpeg_flags()
+        memory_flags = get_high_quality_ffmpeg_flags(profile)
 
         cmd = [
             "ffmpeg", "-y",
@@ -528,18 +2074,12 @@ def create_prompt_tease_segment(original_image: Path, prompt_text: str, output_p
             "-t", "2",
             "-i", str(original_image),
             "-vf", video_filter,
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
-            "-preset", "medium",
-            "-crf", "18",
-            "-r", str(fps),
-            "-threads", "1",
-        ] + memory_flags + [
+        ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
             str(output_path)
         ]
 
         logger.info(f"Running prompt tease FFmpeg command")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = await run_ffmpeg(cmd, timeout=60)
 
         if result.returncode != 0:
             logger.error(f"Prompt tease segment failed: {result.stderr}")
@@ -552,15 +2092,16 @@ def create_prompt_tease_segment(original_image: Path, prompt_text: str, output_p
         logger.error(f"Error creating prompt tease segment: {e}")
         return False
 
-def create_results_showcase(
+async def create_results_showcase(
     result_images: List[Path],
     style_names: List[str],
     output_path: Path,
-    fps: int = 30
+    fps: int = 30,
+    profile: str = "standard"
 ) -> bool:
     """
     [5-12s] Results Showcase: Show each result sequentially
-    Dynamic timing: 7 seconds ÷ array length
+    Dynamic timing: the results share 7 seconds, neighbouring clips overlapping by the transition
     Transitions: fade, slideleft, circleopen, fadeblack
     Text overlay: "Style: {style_name}", Counter: "1/4", "2/4", etc.
     Ken Burns zoom on each
@@ -569,21 +2110,20 @@ def create_results_showcase(
         logger.info("Creating results showcase segment [5-12s]")
 
         total_duration = 7.0
-        duration_per_image = total_duration / len(result_images)
         transition_duration = 0.5
+        duration_per_image = showcase_clip_duration(len(result_images), total_duration, transition_duration)
 
         transitions = ["fade", "slideleft", "circleopen", "fadeblack"]
 
         # Create individual result videos with Ken Burns and text
-        temp_videos = []
         temp_dir = output_path.parent / f"temp_{uuid.uuid4().hex[:8]}"
         temp_dir.mkdir(exist_ok=True)
 
         try:
-            for i, img_path in enumerate(result_images):
-                temp_video = temp_dir / f"result_{i:04d}.mp4"
-                temp_videos.append(temp_video)
+            # Render the per-result clips concurrently
+            temp_videos = [temp_dir / f"result_{i:04d}.mp4" for i in range(len(result_images))]
 
+            async def render_result(i: int, img_path: Path, temp_video: Path) -> None:
                 style_name = style_names[i] if i < len(style_names) else f"Style {i+1}"
                 counter_text = f"{i+1}/{len(result_images)}"
 
@@ -596,16 +2136,16 @@ def create_results_showcase(
                     f"crop={VIDEO_WIDTH}:{VIDEO_HEIGHT},"
                     f"fade=t=in:st=0:d=0.3,"
                     f"drawtext=text='{text_style}':"
-                    f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=64:fontcolor=white:"
+                    f"{drawtext_font()}fontsize=64:fontcolor=white:"
                     f"borderw=3:bordercolor=black:"
                     f"x=(w-text_w)/2:y=105,"
                     f"drawtext=text='{text_counter}':"
-                    f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=48:fontcolor=white:"
+                    f"{drawtext_font()}fontsize=48:fontcolor=white:"
                     f"borderw=3:bordercolor=black:"
                     f"x=(w-text_w)/2:y=h-150"
                 )
 
-                memory_flags = get_high_quality_ffmpeg_flags()
+                memory_flags = get_high_quality_ffmpeg_flags(profile)
 
                 cmd = [
                     "ffmpeg", "-y",
@@ -613,26 +2153,21 @@ def create_results_showcase(
                     "-t", str(duration_per_image),
                     "-i", str(img_path),
                     "-vf", video_filter,
-                    "-c:v", "libx264",
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "medium",
-                    "-crf", "18",
-                    "-r", str(fps),
-                    "-threads", "1",
-                ] + memory_flags + [
+                ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
                     str(temp_video)
                 ]
 
                 logger.info(f"Creating result video {i+1}/{len(result_images)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=90)
+                result = await run_ffmpeg(cmd, timeout=90)
 
                 if result.returncode != 0:
-                    logger.error(f"Error creating result video {i}: {result.stderr}")
-                    return False
+                    raise Exception(f"Error creating result video {i}: {result.stderr}")
 
-                # Force cleanup after each video
-                del img_path
-                gc.collect()
+
+            await gather_or_cancel(*[
+                render_result(i, img_path, temp_video)
+                for i, (img_path, temp_video) in enumerate(zip(result_images, temp_videos))
+            ])
 
             # Force garbage collection after creating all result videos
             gc.collect()
@@ -653,7 +2188,7 @@ def create_results_showcase(
                 for i in range(len(temp_videos) - 1):
                     next_input = f"[{i+1}:v]"
                     transition = transitions[i % len(transitions)]
-                    offset = (i + 1) * duration_per_image - transition_duration
+                    offset = (i + 1) * (duration_per_image - transition_duration)
                     output_label = f"[v{i}]" if i < len(temp_videos) - 2 else "[v]"
 
                     filter_parts.append(
@@ -663,25 +2198,20 @@ def create_results_showcase(
 
                 filter_complex = ";".join(filter_parts)
 
-                memory_flags = get_high_quality_ffmpeg_flags()
+                memory_flags = get_high_quality_ffmpeg_flags(profile)
 
                 cmd = [
                     "ffmpeg", "-y"
                 ] + input_args + [
                     "-filter_complex", filter_complex,
                     "-map", "[v]",
-                    "-c:v", "libx264",
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "medium",
-                    "-crf", "18",
-                    "-r", str(fps),
-                    "-threads", "1",
-                ] + memory_flags + [
+                    "-frames:v", str(round(total_duration * fps)),  # Clips are rounded up to whole frames
+                ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
                     str(output_path)
                 ]
 
                 logger.info(f"Concatenating result videos with transitions")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+                result = await run_ffmpeg(cmd, timeout=120)
 
                 if result.returncode != 0:
                     logger.error(f"Error concatenating results: {result.stderr}")
@@ -698,14 +2228,14 @@ def create_results_showcase(
 
         finally:
             # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            await remove_directory(temp_dir)
             gc.collect()
 
     except Exception as e:
         logger.error(f"Error creating results showcase: {e}")
         return False
 
-def create_branding_segment(last_result_image: Path, logo_path: Optional[Path], output_path: Path, fps: int = 30) -> bool:
+async def create_branding_segment(last_result_image: Path, logo_path: Optional[Path], output_path: Path, fps: int = 30, profile: str = "standard") -> bool:
     """
     [12-14s] Branding: Last result visible (dimmed 20%)
     Text: "500+ Prompts Ready"
@@ -718,7 +2248,7 @@ def create_branding_segment(last_result_image: Path, logo_path: Optional[Path],
         text = escape_ffmpeg_text("500+ Prompts Ready")
 
         # Full HD resolution 1080x1920 with high quality logo
-        memory_flags = get_high_quality_ffmpeg_flags()
+        memory_flags = get_high_quality_ffmpeg_flags(profile)
 
         # Add logo overlay if provided
         if logo_path and logo_path.exists():
@@ -731,18 +2261,13 @@ def create_branding_segment(last_result_image: Path, logo_path: Optional[Path],
                 f"[1:v]scale=120:120:force_original_aspect_ratio=decrease,format=rgba,colorchannelmixer=aa=0.85[logo];"
                 f"[bg][logo]overlay=W-w-45:45[v1];"
                 f"[v1]drawtext=text='{text}':"
-                f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=72:fontcolor=white:"
+                f"{drawtext_font()}fontsize=72:fontcolor=white:"
                 f"borderw=4:bordercolor=black:"
                 f"x=(w-text_w)/2:y=(h-text_h)/2:"
                 f"alpha='if(lt(t,0.5),t/0.5,1)'[v]",
                 "-map", "[v]",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-preset", "medium",
-                "-crf", "18",
-                "-r", str(fps),
+            ] + get_segment_encoding_flags(fps, profile) + [
                 "-t", "2",
-                "-threads", "1",
             ] + memory_flags + [
                 str(output_path)
             ]
@@ -753,7 +2278,7 @@ def create_branding_segment(last_result_image: Path, logo_path: Optional[Path],
                 f"eq=brightness=-0.2,"
                 f"fade=t=in:st=0:d=0.5,"
                 f"drawtext=text='{text}':"
-                f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=72:fontcolor=white:"
+                f"{drawtext_font()}fontsize=72:fontcolor=white:"
                 f"borderw=4:bordercolor=black:"
                 f"x=(w-text_w)/2:y=(h-text_h)/2:"
                 f"alpha='if(lt(t,0.5),t/0.5,1)'"
@@ -764,18 +2289,12 @@ def create_branding_segment(last_result_image: Path, logo_path: Optional[Path],
                 "-t", "2",
                 "-i", str(last_result_image),
                 "-vf", video_filter,
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-preset", "medium",
-                "-crf", "18",
-                "-r", str(fps),
-                "-threads", "1",
-            ] + memory_flags + [
+            ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
                 str(output_path)
             ]
 
         logger.info(f"Running branding FFmpeg command")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = await run_ffmpeg(cmd, timeout=60)
 
         if result.returncode != 0:
             logger.error(f"Branding segment failed: {result.stderr}")
@@ -788,7 +2307,7 @@ def create_branding_segment(last_result_image: Path, logo_path: Optional[Path],
         logger.error(f"Error creating branding segment: {e}")
         return False
 
-def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Optional[Path], output_path: Path, fps: int = 30) -> bool:
+async def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Optional[Path], output_path: Path, fps: int = 30, profile: str = "standard") -> bool:
     """
     [14-15s] Call-to-Action: Show custom CTA text
     Pulse animation (scale 1.0 → 1.05 → 1.0)
@@ -800,7 +2319,7 @@ def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Option
         text = escape_ffmpeg_text(cta_text)
 
         # Full HD resolution 1080x1920 with high quality text and logo
-        memory_flags = get_high_quality_ffmpeg_flags()
+        memory_flags = get_high_quality_ffmpeg_flags(profile)
 
         base_filter = (
             f"scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:force_original_aspect_ratio=increase,"
@@ -810,7 +2329,7 @@ def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Option
 
         text_filter = (
             f"drawtext=text='{text}':"
-            f"fontfile=/Windows/Fonts/arialbd.ttf:fontsize=80:fontcolor=white:"
+            f"{drawtext_font()}fontsize=80:fontcolor=white:"
             f"borderw=4:bordercolor=black:"
             f"x=(w-text_w)/2:y=(h-text_h)/2"
         )
@@ -826,13 +2345,8 @@ def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Option
                 f"[bg][logo]overlay=W-w-45:45[v1];"
                 f"[v1]{text_filter}[v]",
                 "-map", "[v]",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-preset", "medium",
-                "-crf", "18",
-                "-r", str(fps),
+            ] + get_segment_encoding_flags(fps, profile) + [
                 "-t", "1",
-                "-threads", "1",
             ] + memory_flags + [
                 str(output_path)
             ]
@@ -843,18 +2357,12 @@ def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Option
                 "-t", "1",
                 "-i", str(last_result_image),
                 "-vf", f"{base_filter},{text_filter}",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-preset", "medium",
-                "-crf", "18",
-                "-r", str(fps),
-                "-threads", "1",
-            ] + memory_flags + [
+            ] + get_segment_encoding_flags(fps, profile) + memory_flags + [
                 str(output_path)
             ]
 
         logger.info(f"Running CTA FFmpeg command")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = await run_ffmpeg(cmd, timeout=60)
 
         if result.returncode != 0:
             logger.error(f"CTA segment failed: {result.stderr}")
@@ -867,14 +2375,15 @@ def create_cta_segment(last_result_image: Path, cta_text: str, logo_path: Option
         logger.error(f"Error creating CTA segment: {e}")
         return False
 
-def create_video_from_images(
+async def create_video_from_images(
     image_paths: List[Path],
     output_path: Path,
     duration_per_image: float = 2.0,
     transition_duration: float = 1.0,
     fps: int = 25,
     text_content: Optional[str] = None,
-    second_text_content: Optional[str] = None
+    second_text_content: Optional[str] = None,
+    profile: str = "draft"
 ) -> bool:
     """Create video from images using FFmpeg"""
     try:
@@ -939,20 +2448,19 @@ def create_video_from_images(
                     "-vf", video_filter,
                     "-c:v", "libx264",
                     "-pix_fmt", "yuv420p",
-                    "-preset", "medium",
-                    "-crf", "28",
+                ] + get_profile_encoding_flags(fps, profile) + [
                     "-r", str(fps),
                     "-movflags", "+faststart",
                     "-an",  # No audio stream
+                ] + get_high_quality_ffmpeg_flags(profile) + [
                     str(output_path)
                 ]
 
                 logger.info(f"FFmpeg command: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=180)
+                result = await run_ffmpeg(cmd, timeout=180)
 
                 if result.returncode != 0:
                     logger.error(f"FFmpeg error (return code {result.returncode}): {result.stderr}")
-                    logger.error(f"FFmpeg stdout: {result.stdout}")
                     return False
 
                 # Check output file size
@@ -1035,16 +2543,16 @@ def create_video_from_images(
                         "-vf", video_filter,
                         "-c:v", "libx264",
                         "-pix_fmt", "yuv420p",
-                        "-preset", "medium",
-                        "-crf", "28",
+                    ] + get_profile_encoding_flags(fps, profile) + [
                         "-r", str(fps),
                         "-an",
+                    ] + get_high_quality_ffmpeg_flags(profile) + [
                         str(temp_video)
                     ]
 
                     logger.info(f"Creating video {i+1}/{len(image_paths)} with fade effects (duration: {video_duration}s)")
                     logger.info(f"Filter: {video_filter}")
-                    result = subprocess.run(single_cmd, capture_output=True, text=True, timeout=90)
+                    result = await run_ffmpeg(single_cmd, timeout=90)
                     if result.returncode != 0:
                         logger.error(f"Error creating video for image {i}: {result.stderr}")
                         return False
@@ -1076,7 +2584,7 @@ def create_video_from_images(
                 ]
 
                 logger.info(f"Concatenating videos with fade transitions")
-                result = subprocess.run(concat_cmd, capture_output=True, text=True, timeout=180)
+                result = await run_ffmpeg(concat_cmd, timeout=180)
                 if result.returncode != 0:
                     logger.error(f"Error concatenating videos: {result.stderr}")
                     return False
@@ -1089,16 +2597,13 @@ def create_video_from_images(
                 logger.info(f"Portrait slideshow with fade transitions created successfully: {output_path.stat().st_size} bytes")
                 return True
 
-    except subprocess.TimeoutExpired as e:
-        logger.error(f"FFmpeg command timed out: {e}")
-        return False
     except Exception as e:
         logger.error(f"Error creating video: {e}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
 
-def create_inspix_video(
+async def create_inspix_video(
     original_image: Path,
     result_images: List[Path],
     output_path: Path,
@@ -1107,7 +2612,8 @@ def create_inspix_video(
     logo_path: Optional[Path] = None,
     cta_text: str = "Link in Bio 👆",
     fps: int = 30,
-    music_path: Optional[Path] = None
+    music_path: Optional[Path] = None,
+    profile: str = "standard"
 ) -> bool:
     """
     Create complete 15-second video following the exact timeline:
@@ -1128,8 +2634,6 @@ def create_inspix_video(
         temp_dir.mkdir(exist_ok=True)
 
         try:
-            segments = []
-
             # Auto-generate prompt text if not provided
             if not prompt_text:
                 prompt_text = auto_generate_prompt_preview(len(result_images))
@@ -1138,53 +2642,82 @@ def create_inspix_video(
             if not style_names or len(style_names) < len(result_images):
                 style_names = [f"Style {i+1}" for i in range(len(result_images))]
 
-            # [0-1s] Hook Grid
-            logger.info("Creating segment 1/6: Hook Grid [0-1s]")
-            segment1 = temp_dir / "segment1_hook_grid.mp4"
-            if not create_hook_grid(result_images, segment1, fps):
-                raise Exception("Failed to create hook grid segment")
-            segments.append(segment1)
-            gc.collect()  # Free memory after segment creation
+            # Ingest: decode and scale every source once into the cached canonical variants
+            logger.info("Normalizing source images")
+            grid_count = min(4, len(result_images))
+            original_variants, *result_variants = await gather_or_cancel(
+                image_variant_cache.get(original_image, ["letterbox"], temp_dir),
+                *[
+                    image_variant_cache.get(img_path, ["cover", "grid"] if i < grid_count else ["cover"], temp_dir)
+                    for i, img_path in enumerate(result_images)
+                ]
+            )
+            original_letterbox = original_variants["letterbox"]
+            result_covers = [variants["cover"] for variants in result_variants]
+            grid_cells = [variants["grid"] for variants in result_variants[:grid_count]]
 
-            # [1-3s] Original Photo
-            logger.info("Creating segment 2/6: Original Photo [1-3s]")
+            segment1 = temp_dir / "segment1_hook_grid.mp4"
             segment2 = temp_dir / "segment2_original.mp4"
-            if not create_original_photo_segment(original_image, segment2, fps):
-                raise Exception("Failed to create original photo segment")
-            segments.append(segment2)
-            gc.collect()  # Free memory after segment creation
-
-            # [3-5s] Prompt Tease
-            logger.info("Creating segment 3/6: Prompt Tease [3-5s]")
             segment3 = temp_dir / "segment3_prompt.mp4"
-            if not create_prompt_tease_segment(original_image, prompt_text, segment3, fps):
-                raise Exception("Failed to create prompt tease segment")
-            segments.append(segment3)
-            gc.collect()  # Free memory after segment creation
-
-            # [5-12s] Results Showcase
-            logger.info("Creating segment 4/6: Results Showcase [5-12s]")
             segment4 = temp_dir / "segment4_results.mp4"
-            if not create_results_showcase(result_images, style_names, segment4, fps):
-                raise Exception("Failed to create results showcase segment")
-            segments.append(segment4)
-            gc.collect()  # Free memory after segment creation
-
-            # [12-14s] Branding
-            logger.info("Creating segment 5/6: Branding [12-14s]")
             segment5 = temp_dir / "segment5_branding.mp4"
-            last_result = result_images[-1]
-            if not create_branding_segment(last_result, logo_path, segment5, fps):
-                raise Exception("Failed to create branding segment")
-            segments.append(segment5)
-            gc.collect()  # Free memory after segment creation
-
-            # [14-15s] Call-to-Action
-            logger.info("Creating segment 6/6: CTA [14-15s]")
             segment6 = temp_dir / "segment6_cta.mp4"
-            if not create_cta_segment(last_result, cta_text, logo_path, segment6, fps):
-                raise Exception("Failed to create CTA segment")
-            segments.append(segment6)
+            segments = [segment1, segment2, segment3, segment4, segment5, segment6]
+            last_result = result_covers[-1]
+
+            async def require_segment(
+                name: str,
+                inputs: List[Optional[Path]],
+                params: Dict[str, Any],
+                output: Path,
+                build: Callable[[Path], Any]
+            ) -> None:
+                stage = name.replace(" ", "_").lower()
+
+                async def timed_build(path: Path) -> bool:
+                    with SEGMENT_SECONDS.labels(segment=stage).time():
+                        return await build(path)
+
+                # Reuse an identical segment rendered for an earlier request when possible
+                with progress_stage(stage):
+                    if not await segment_cache.render(name, inputs, params, fps, profile, output, timed_build):
+                        raise Exception(f"Failed to create {name} segment")
+
+            # The segments are independent until the final concat, so render them
+            # concurrently; run_ffmpeg caps how many FFmpeg processes run at once
+            logger.info("Creating 6 timeline segments concurrently")
+            await gather_or_cancel(
+                # [0-1s] Hook Grid
+                require_segment(
+                    "hook grid", grid_cells, {}, segment1,
+                    lambda out: create_hook_grid(grid_cells, out, fps, prescaled=True, profile=profile)
+                ),
+                # [1-3s] Original Photo
+                require_segment(
+                    "original photo", [original_letterbox], {}, segment2,
+                    lambda out: create_original_photo_segment(original_letterbox, out, fps, profile)
+                ),
+                # [3-5s] Prompt Tease
+                require_segment(
+                    "prompt tease", [original_letterbox], {"prompt_text": prompt_text}, segment3,
+                    lambda out: create_prompt_tease_segment(original_letterbox, prompt_text, out, fps, profile)
+                ),
+                # [5-12s] Results Showcase
+                require_segment(
+                    "results showcase", result_covers, {"style_names": style_names[:len(result_covers)]}, segment4,
+                    lambda out: create_results_showcase(result_covers, style_names, out, fps, profile)
+                ),
+                # [12-14s] Branding
+                require_segment(
+                    "branding", [last_result, logo_path], {}, segment5,
+                    lambda out: create_branding_segment(last_result, logo_path, out, fps, profile)
+                ),
+                # [14-15s] Call-to-Action
+                require_segment(
+                    "CTA", [last_result, logo_path], {"cta_text": cta_text}, segment6,
+                    lambda out: create_cta_segment(last_result, cta_text, logo_path, out, fps, profile)
+                ),
+            )
             gc.collect()  # Free memory after segment creation
 
             # Concatenate all segments
@@ -1196,58 +2729,46 @@ def create_inspix_video(
                     segment_path = str(segment.resolve()).replace('\\', '/')
                     f.write(f"file '{segment_path}'\n")
 
-            # Concatenate with audio track (either background music or silent)
-            memory_flags = get_high_quality_ffmpeg_flags()
-
+            # Concatenate with audio track (either background music or silent).
+            # Segments share one encoding contract, so the video is stream-copied
+            # and only the audio is encoded.
             if music_path and music_path.exists():
                 # Use provided background music, loop it to match video duration
                 logger.info(f"Adding background music: {music_path}")
-                concat_cmd = [
-                    "ffmpeg", "-y",
-                    "-f", "concat",
-                    "-safe", "0",
-                    "-i", str(concat_file),
+                audio_args = [
                     "-stream_loop", "-1",  # Loop audio indefinitely
                     "-i", str(music_path),
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "128k",  # Higher quality for background music
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "medium",
-                    "-crf", "18",
-                    "-shortest",  # End when video ends
-                    "-map", "0:v:0",  # Video from first input
-                    "-map", "1:a:0",  # Audio from second input
-                    "-movflags", "+faststart",
-                    "-threads", "1",
-                ] + memory_flags + [
-                    str(output_path)
                 ]
+                audio_bitrate = "128k"  # Higher quality for background music
             else:
                 # Use silent AAC audio track for Instagram compatibility
                 logger.info("Adding silent audio track")
-                concat_cmd = [
-                    "ffmpeg", "-y",
-                    "-f", "concat",
-                    "-safe", "0",
-                    "-i", str(concat_file),
+                audio_args = [
                     "-f", "lavfi",
                     "-i", "anullsrc=channel_layout=stereo:sample_rate=44100",
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "64k",  # Reduced from 96k
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "medium",
-                    "-crf", "18",
-                    "-shortest",
-                    "-movflags", "+faststart",
-                    "-threads", "1",
-                ] + memory_flags + [
-                    str(output_path)
                 ]
+                audio_bitrate = "64k"  # Reduced from 96k
+
+            concat_cmd = [
+                "ffmpeg", "-y",
+                "-f", "concat",
+                "-safe", "0",
+                "-i", str(concat_file),
+            ] + audio_args + [
+                "-map", "0:v:0",  # Video from the segment list
+                "-map", "1:a:0",  # Audio from second input
+                "-c:v", "copy",
+                "-c:a", "aac",
+                "-b:a", audio_bitrate,
+                "-shortest",  # End when video ends
+                "-movflags", "+faststart",
+                "-max_muxing_queue_size", "1024",
+                str(output_path)
+            ]
 
             logger.info("Running final concatenation with audio track")
-            result = subprocess.run(concat_cmd, capture_output=True, text=True, timeout=VIDEO_TIMEOUT)
+            with SEGMENT_SECONDS.labels(segment="final_concat").time(), progress_stage("final_concat"):
+                result = await run_ffmpeg(concat_cmd, timeout=VIDEO_TIMEOUT)
 
             if result.returncode != 0:
                 logger.error(f"Final concatenation failed: {result.stderr}")
@@ -1274,7 +2795,7 @@ def create_inspix_video(
                 "-of", "default=noprint_wrappers=1:nokey=1",
                 str(output_path)
             ]
-            duration_result = subprocess.run(duration_cmd, capture_output=True, text=True, timeout=10)
+            duration_result = await run_ffmpeg(duration_cmd, timeout=10, capture_stdout=True)
             if duration_result.returncode == 0:
                 try:
                     duration = float(duration_result.stdout.strip())
@@ -1286,7 +2807,7 @@ def create_inspix_video(
 
         finally:
             # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            await remove_directory(temp_dir)
             gc.collect()
 
     except Exception as e:
@@ -1295,12 +2816,712 @@ def create_inspix_video(
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
 
-def add_audio_to_video(video_path: Path, audio_path: Path, output_path: Path) -> bool:
-    """Add audio track to video"""
+def hold_still_frame(duration: float, fps: int) -> str:
+    """Filter snippet that repeats a single (already filtered) frame for `duration` seconds"""
+    frames = max(1, math.ceil(duration * fps - 1e-6))
+    return f"loop=loop={frames - 1}:size=1:start=0,settb=1/{fps},setpts=N"
+
+def build_inspix_filter_graph(
+    original_image: Path,
+    result_images: List[Path],
+    prompt_text: str,
+    style_names: List[str],
+    logo_path: Optional[Path],
+    cta_text: str,
+    fps: int = 30
+) -> tuple:
+    """
+    Compile the whole inspix timeline into one filter_complex graph.
+
+    Every source image is an input decoded once and split for each use.
+    Static filters (scale, crop, pad, dimming, fixed text) run on that single
+    frame before it is held for the segment duration, so only the animated
+    parts (fades, xfade, alpha text) are evaluated per output frame.
+    Returns (input_args, filter_complex, video_duration).
+    """
+    # Decode each distinct source once
+    sources = [original_image] + list(result_images)
+    if logo_path:
+        sources.append(logo_path)
+    input_args = []
+    for source in sources:
+        input_args.extend(["-i", str(source)])
+
+    original_index = 0
+    result_index = [1 + i for i in range(len(result_images))]
+    logo_index = len(sources) - 1 if logo_path else None
+    last_result = len(result_images) - 1
+
+    # Work out how many times each source is used so it can be split once
+    grid_sources = [i % len(result_images) for i in range(4)]
+    uses = {original_index: 2}
+    for i in range(len(result_images)):
+        uses[result_index[i]] = grid_sources.count(i) + 1  # grid cells + showcase clip
+    uses[result_index[last_result]] += 2  # branding + CTA backgrounds
+    if logo_index is not None:
+        uses[logo_index] = 2  # branding + CTA overlays
+
+    filters = []
+    taken = {index: 0 for index in uses}
+
+    def take(index: int) -> str:
+        label = f"[in{index}_{taken[index]}]"
+        taken[index] += 1
+        return label
+
+    for index, count in uses.items():
+        outputs = "".join(f"[in{index}_{n}]" for n in range(count))
+        filters.append(f"[{index}:v]split={count}{outputs}" if count > 1 else f"[{index}:v]null{outputs}")
+
+    cover_filter = (
+        f"scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:force_original_aspect_ratio=increase,"
+        f"crop={VIDEO_WIDTH}:{VIDEO_HEIGHT},setsar=1"
+    )
+    letterbox_filter = (
+        f"scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:force_original_aspect_ratio=decrease,"
+        f"pad={VIDEO_WIDTH}:{VIDEO_HEIGHT}:(ow-iw)/2:(oh-ih)/2:black,setsar=1"
+    )
+    logo_filter = "scale=120:120:force_original_aspect_ratio=decrease,format=rgba,colorchannelmixer=aa=0.85"
+
+    # [0-1s] Hook Grid: stack the four static cells, then hold the stacked frame
+    for cell, source in enumerate(grid_sources):
+        filters.append(
+            f"{take(result_index[source])}scale=594:1056:force_original_aspect_ratio=increase,"
+            f"crop=540:960,setsar=1[cell{cell}]"
+        )
+    filters.append("[cell0][cell1]hstack=inputs=2[top]")
+    filters.append("[cell2][cell3]hstack=inputs=2[bottom]")
+    filters.append(f"[top][bottom]vstack=inputs=2,{hold_still_frame(1, fps)}[seg0]")
+
+    # [1-3s] Original Photo
+    text = escape_ffmpeg_text("This Photo +")
+    filters.append(
+        f"{take(original_index)}{letterbox_filter},{hold_still_frame(2, fps)},"
+        f"fade=t=in:st=0:d=0.5,"
+        f"drawtext=text='{text}':"
+        f"{drawtext_font()}fontsize=80:fontcolor=white:"
+        f"borderw=4:bordercolor=black:"
+        f"x=(w-text_w)/2:y=(h-text_h)/2+300[seg1]"
+    )
+
+    # [3-5s] Prompt Tease: fully static, so all filtering happens on one frame
+    text1 = escape_ffmpeg_text("+ inspix Prompt =")
+    text2 = escape_ffmpeg_text(prompt_text)
+    filters.append(
+        f"{take(original_index)}{letterbox_filter},"
+        f"eq=brightness=-0.3,"
+        f"drawtext=text='{text1}':"
+        f"{drawtext_font()}fontsize=64:fontcolor=white:"
+        f"borderw=3:bordercolor=black:"
+        f"x=(w-text_w)/2:y=(h)/2-105,"
+        f"drawtext=text='{text2}':"
+        f"{drawtext_font()}fontsize=48:fontcolor=white:"
+        f"borderw=3:bordercolor=black:"
+        f"x=(w-text_w)/2:y=(h)/2+52,"
+        f"{hold_still_frame(2, fps)}[seg2]"
+    )
+
+    # [5-12s] Results Showcase: one held clip per result, chained with xfade
+    total_duration = 7.0
+    transition_duration = 0.5
+    duration_per_image = showcase_clip_duration(len(result_images), total_duration, transition_duration)
+    transitions = ["fade", "slideleft", "circleopen", "fadeblack"]
+
+    for i in range(len(result_images)):
+        style_name = style_names[i] if i < len(style_names) else f"Style {i+1}"
+        text_style = escape_ffmpeg_text(f"Style\\: {style_name}")
+        text_counter = escape_ffmpeg_text(f"{i+1}/{len(result_images)}")
+        filters.append(
+            f"{take(result_index[i])}{cover_filter},{hold_still_frame(duration_per_image, fps)},"
+            f"fade=t=in:st=0:d=0.3,"
+            f"drawtext=text='{text_style}':"
+            f"{drawtext_font()}fontsize=64:fontcolor=white:"
+            f"borderw=3:bordercolor=black:"
+            f"x=(w-text_w)/2:y=105,"
+            f"drawtext=text='{text_counter}':"
+            f"{drawtext_font()}fontsize=48:fontcolor=white:"
+            f"borderw=3:bordercolor=black:"
+            f"x=(w-text_w)/2:y=h-150[res{i}]"
+        )
+
+    current_label = "[res0]"
+    for i in range(len(result_images) - 1):
+        transition = transitions[i % len(transitions)]
+        offset = (i + 1) * (duration_per_image - transition_duration)
+        output_label = f"[xf{i}]"
+        filters.append(
+            f"{current_label}[res{i+1}]xfade=transition={transition}:duration={transition_duration}:offset={offset}{output_label}"
+        )
+        current_label = output_label
+    # Clips are rounded up to whole frames; cut the chain back to the showcase length
+    filters.append(f"{current_label}trim=end_frame={round(total_duration * fps)}[seg3]")
+    showcase_duration = total_duration
+
+    # [12-14s] Branding: the dimmed background fades in, logo and text are layered on top
+    text = escape_ffmpeg_text("500+ Prompts Ready")
+    branding_text = (
+        f"drawtext=text='{text}':"
+        f"{drawtext_font()}fontsize=72:fontcolor=white:"
+        f"borderw=4:bordercolor=black:"
+        f"x=(w-text_w)/2:y=(h-text_h)/2:"
+        f"alpha='if(lt(t,0.5),t/0.5,1)'"
+    )
+    branding_bg = (
+        f"{take(result_index[last_result])}{cover_filter},eq=brightness=-0.2,"
+        f"{hold_still_frame(2, fps)},fade=t=in:st=0:d=0.5"
+    )
+    if logo_index is not None:
+        filters.append(f"{branding_bg}[brand_bg]")
+        filters.append(f"{take(logo_index)}{logo_filter}[brand_logo]")
+        filters.append(f"[brand_bg][brand_logo]overlay=W-w-45:45,{branding_text}[seg4]")
+    else:
+        filters.append(f"{branding_bg},{branding_text}[seg4]")
+
+    # [14-15s] Call-to-Action: fully static
+    text = escape_ffmpeg_text(cta_text)
+    cta_text_filter = (
+        f"drawtext=text='{text}':"
+        f"{drawtext_font()}fontsize=80:fontcolor=white:"
+        f"borderw=4:bordercolor=black:"
+        f"x=(w-text_w)/2:y=(h-text_h)/2"
+    )
+    cta_bg = f"{take(result_index[last_result])}{cover_filter},eq=brightness=-0.2"
+    if logo_index is not None:
+        filters.append(f"{cta_bg}[cta_bg]")
+        filters.append(f"{take(logo_index)}{logo_filter}[cta_logo]")
+        filters.append(f"[cta_bg][cta_logo]overlay=W-w-45:45,{cta_text_filter},{hold_still_frame(1, fps)}[seg5]")
+    else:
+        filters.append(f"{cta_bg},{cta_text_filter},{hold_still_frame(1, fps)}[seg5]")
+
+    # Join the timeline inside the graph
+    for n in range(6):
+        filters.append(f"[seg{n}]format=yuv420p,setsar=1[fmt{n}]")
+    filters.append("".join(f"[fmt{n}]" for n in range(6)) + "concat=n=6:v=1:a=0[v]")
+
+    video_duration = 1 + 2 + 2 + showcase_duration + 2 + 1
+    return input_args, ";".join(filters), video_duration
+
+def background_audio_args(music_path: Optional[Path]) -> Tuple[List[str], str]:
+    """Input args for the looped background music, or silence; returns (args, aac bitrate)"""
+    if music_path and music_path.exists():
+        logger.info(f"Adding background music: {music_path}")
+        return ["-stream_loop", "-1", "-i", str(music_path)], "128k"
+    logger.info("Adding silent audio track")
+    return ["-f", "lavfi", "-i", "anullsrc=channel_layout=stereo:sample_rate=44100"], "64k"
+
+def build_single_pass_command(
+    original_image: Path,
+    result_images: List[Path],
+    output_args: List[str],
+    prompt_text: Optional[str] = None,
+    style_names: Optional[List[str]] = None,
+    logo_path: Optional[Path] = None,
+    cta_text: str = "Link in Bio 👆",
+    fps: int = 30,
+    music_path: Optional[Path] = None,
+    profile: str = "standard"
+) -> Tuple[List[str], float]:
+    """
+    Build the single-pass FFmpeg command for the inspix timeline, writing to
+    output_args (a file path or a pipe). Returns (cmd, video_duration).
+    """
+    # Auto-generate prompt text if not provided
+    if not prompt_text:
+        prompt_text = auto_generate_prompt_preview(len(result_images))
+
+    # Auto-generate style names if not provided
+    if not style_names or len(style_names) < len(result_images):
+        style_names = [f"Style {i+1}" for i in range(len(result_images))]
+
+    if logo_path and not logo_path.exists():
+        logo_path = None
+
+    input_args, filter_complex, video_duration = build_inspix_filter_graph(
+        original_image, result_images, prompt_text, style_names, logo_path, cta_text, fps
+    )
+    audio_index = len(input_args) // 2
+    audio_args, audio_bitrate = background_audio_args(music_path)
+
+    memory_flags = get_high_quality_ffmpeg_flags(profile)
+
+    cmd = [
+        "ffmpeg", "-y",
+    ] + input_args + audio_args + [
+        "-filter_complex", filter_complex,
+        "-map", "[v]",
+        "-map", f"{audio_index}:a:0",
+        "-c:v", "libx264",
+        "-c:a", "aac",
+        "-b:a", audio_bitrate,
+        "-pix_fmt", "yuv420p",
+    ] + get_profile_encoding_flags(fps, profile) + [
+        "-r", str(fps),
+        "-t", f"{video_duration:.3f}",
+    ] + memory_flags + output_args
+
+    return cmd, video_duration
+
+async def create_inspix_video_single_pass(
+    original_image: Path,
+    result_images: List[Path],
+    output_path: Path,
+    prompt_text: Optional[str] = None,
+    style_names: Optional[List[str]] = None,
+    logo_path: Optional[Path] = None,
+    cta_text: str = "Link in Bio 👆",
+    fps: int = 30,
+    music_path: Optional[Path] = None,
+    profile: str = "standard"
+) -> bool:
+    """
+    Render the same timeline as create_inspix_video with a single FFmpeg
+    invocation: one filter graph, one libx264 encode, no intermediate files.
+    """
     try:
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(video_path),
+        logger.info("Creating inspix video in a single filter-graph pass")
+
+        cmd, video_duration = build_single_pass_command(
+            original_image,
+            result_images,
+            ["-movflags", "+faststart", str(output_path)],
+            prompt_text,
+            style_names,
+            logo_path,
+            cta_text,
+            fps,
+            music_path,
+            profile
+        )
+
+        logger.info("Running single-pass timeline FFmpeg command")
+        with progress_stage("render"):
+            result = await run_ffmpeg(cmd, timeout=VIDEO_TIMEOUT)
+
+        if result.returncode != 0:
+            logger.error(f"Single-pass render failed: {result.stderr}")
+            return False
+
+        # Verify output
+        if not output_path.exists() or output_path.stat().st_size < 10000:
+            logger.error("Output video file is missing or too small")
+            return False
+
+        file_size_mb = output_path.stat().st_size / (1024 * 1024)
+        logger.info(f"Video created successfully: {file_size_mb:.2f} MB ({video_duration:.2f}s timeline)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error creating single-pass inspix video: {e}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return False
+
+# RGB levels per unit of eq=brightness, as measured on FFmpeg's output for JPEG sources
+EQ_BRIGHTNESS_SCALE = 320
+
+class FrameLayer(NamedTuple):
+    """Premultiplied RGBA overlay, cropped to its visible box"""
+    top: int
+    left: int
+    color: np.ndarray  # h x w x 3 float32, already multiplied by alpha
+    alpha: np.ndarray  # h x w x 1 float32 in [0, 1]
+
+class TimelineSpan(NamedTuple):
+    """A run of output frames; a static span is one frame repeated"""
+    frames: int
+    render: Callable[[int], bytes]  # Frame number within the span -> rgb24 frame
+    static: bool
+
+@functools.lru_cache(maxsize=32)
+def compositor_font(path: Optional[str], size: int) -> ImageFont.FreeTypeFont:
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size=size)
+
+def make_layer(canvas: Image.Image) -> FrameLayer:
+    """Premultiply a full-frame RGBA canvas and crop it to its non-transparent box"""
+    box = canvas.getbbox() or (0, 0, 0, 0)
+    rgba = np.asarray(canvas.crop(box), dtype=np.float32).reshape(box[3] - box[1], box[2] - box[0], 4)
+    alpha = rgba[..., 3:] / 255
+    return FrameLayer(box[1], box[0], rgba[..., :3] * alpha, alpha)
+
+def apply_layer(frame: np.ndarray, layer: FrameLayer, opacity: float = 1.0) -> None:
+    """Blend a layer over a float32 frame in place"""
+    height, width = layer.alpha.shape[:2]
+    region = frame[layer.top:layer.top + height, layer.left:layer.left + width]
+    if opacity >= 1:
+        region *= 1 - layer.alpha
+        region += layer.color
+    else:
+        region *= 1 - opacity * layer.alpha
+        region += opacity * layer.color
+
+def text_layer(text: str, fontsize: int, border: int, y: Callable[[int], float]) -> FrameLayer:
+    """drawtext equivalent: white bordered text centred horizontally, top edge at y(text height)"""
+    font = compositor_font(ffmpeg_capabilities.fonts.get("bold"), fontsize)
+    canvas = Image.new("RGBA", (VIDEO_WIDTH, VIDEO_HEIGHT), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    draw.text(
+        ((VIDEO_WIDTH - (right - left)) / 2 - left, y(bottom - top) - top),
+        text, font=font, fill="white", stroke_width=border, stroke_fill="black"
+    )
+    return make_layer(canvas)
+
+def logo_layer(logo_path: Path) -> FrameLayer:
+    """Logo fitted into 120x120 at 85% opacity, 45px from the top-right corner"""
+    with Image.open(logo_path) as logo:
+        logo = ImageOps.contain(logo.convert("RGBA"), (120, 120), Image.BICUBIC)
+    logo.putalpha(logo.getchannel("A").point(lambda a: round(a * 0.85)))
+    canvas = Image.new("RGBA", (VIDEO_WIDTH, VIDEO_HEIGHT), (0, 0, 0, 0))
+    canvas.paste(logo, (VIDEO_WIDTH - logo.width - 45, 45))
+    return make_layer(canvas)
+
+def cover_frame(image: Image.Image) -> np.ndarray:
+    """Scale to cover the frame and centre-crop, as float32 RGB"""
+    return np.asarray(ImageOps.fit(image, (VIDEO_WIDTH, VIDEO_HEIGHT), Image.BICUBIC), dtype=np.float32)
+
+def letterbox_frame(image: Image.Image) -> np.ndarray:
+    """Scale to fit inside the frame on black, as float32 RGB"""
+    return np.asarray(ImageOps.pad(image, (VIDEO_WIDTH, VIDEO_HEIGHT), Image.BICUBIC, color="black"), dtype=np.float32)
+
+def dim_frame(frame: np.ndarray, brightness: float) -> np.ndarray:
+    return np.clip(frame + brightness * EQ_BRIGHTNESS_SCALE, 0, 255)
+
+def to_rgb24(frame: np.ndarray) -> bytes:
+    return frame.round().astype(np.uint8).tobytes()
+
+def smoothstep(edge0: float, edge1: float, x):
+    t = np.clip((x - edge0) / (edge1 - edge0), 0, 1)
+    return t * t * (3 - 2 * t)
+
+@functools.lru_cache(maxsize=1)
+def xfade_circle_distance() -> np.ndarray:
+    """Distance of each pixel from the frame centre, 1.0 at the corners"""
+    y, x = np.ogrid[:VIDEO_HEIGHT, :VIDEO_WIDTH]
+    return (np.hypot(x - VIDEO_WIDTH / 2, y - VIDEO_HEIGHT / 2) / math.hypot(VIDEO_WIDTH / 2, VIDEO_HEIGHT / 2)).astype(np.float32)
+
+def xfade_frame(transition: str, a: np.ndarray, b: np.ndarray, progress: float) -> np.ndarray:
+    """One frame of FFmpeg's xfade from a to b; progress runs from 1 (all a) down to 0 (all b)"""
+    if transition == "slideleft":
+        shift = int(progress * VIDEO_WIDTH)
+        return np.concatenate((a[:, VIDEO_WIDTH - shift:], b[:, :VIDEO_WIDTH - shift]), axis=1)
+    if transition == "circleopen":
+        weight = smoothstep(0.0, 1.0, xfade_circle_distance() + (progress - 0.5) * 3)[..., None]
+        return a * weight + b * (1 - weight)
+    if transition == "fadeblack":
+        a_weight = smoothstep(0.8, 1.0, progress) * progress
+        b_weight = (1 - smoothstep(0.2, 1.0, progress)) * (1 - progress)
+        return a * a_weight + b * b_weight
+    return a * progress + b * (1 - progress)  # fade
+
+def split_timeline(
+    frames: int,
+    fps: int,
+    render_at: Callable[[float], bytes],
+    still_at: Callable[[float], Optional[str]]
+) -> List[TimelineSpan]:
+    """
+    Cut a segment of `frames` frames into spans. Consecutive frames for which
+    still_at(t) returns the same key are one static span rendered once; frames
+    where it returns None are animated and rendered one by one.
+    """
+    spans = []
+    start = 0
+    while start < frames:
+        key = still_at(start / fps)
+        end = start + 1
+        while end < frames and still_at(end / fps) == key:
+            end += 1
+        if key is None:
+            spans.append(TimelineSpan(end - start, lambda k, s=start: render_at((s + k) / fps), False))
+        else:
+            spans.append(TimelineSpan(end - start, lambda k, s=start: render_at(s / fps), True))
+        start = end
+    return spans
+
+def build_compositor_timeline(
+    original_image: Path,
+    result_images: List[Path],
+    prompt_text: str,
+    style_names: List[str],
+    logo_path: Optional[Path],
+    cta_text: str,
+    fps: int = 30
+) -> Tuple[List[TimelineSpan], float]:
+    """
+    Lay out the inspix timeline as spans of rgb24 frames composited with
+    Pillow and NumPy. Every source is decoded and scaled once; static frames
+    (text, logo, dimming baked in) are built once, and fades, xfades and the
+    alpha text ramp are blended per frame. Blocking: run in a thread.
+    Returns (spans, video_duration).
+    """
+    def load(path: Path) -> Image.Image:
+        with Image.open(path) as img:
+            return img.convert("RGB")
+
+    def segment_frames(duration: float) -> int:
+        return max(1, math.ceil(duration * fps - 1e-6))
+
+    def still(frame: bytes) -> Callable[[float], bytes]:
+        return lambda t: frame
+
+    original = load(original_image)
+    results = [load(path) for path in result_images]
+    covers = [cover_frame(img) for img in results]
+    logo = logo_layer(logo_path) if logo_path else None
+    spans = []
+
+    # [0-1s] Hook Grid: four covered cells in a 2x2 grid
+    grid = Image.new("RGB", (VIDEO_WIDTH, VIDEO_HEIGHT))
+    for cell in range(4):
+        tile = ImageOps.fit(results[cell % len(results)], (594, 1056), Image.BICUBIC).crop((27, 48, 567, 1008))
+        grid.paste(tile, ((cell % 2) * 540, (cell // 2) * 960))
+    spans += split_timeline(segment_frames(1), fps, still(grid.tobytes()), lambda t: "grid")
+
+    # [1-3s] Original Photo: fades in from black under fixed text
+    photo = letterbox_frame(original)
+    photo_text = text_layer("This Photo +", 80, 4, lambda h: (VIDEO_HEIGHT - h) / 2 + 300)
+
+    def photo_at(t: float) -> bytes:
+        frame = photo * min(t / 0.5, 1.0)
+        apply_layer(frame, photo_text)
+        return to_rgb24(frame)
+
+    spans += split_timeline(segment_frames(2), fps, photo_at, lambda t: "photo" if t >= 0.5 else None)
+
+    # [3-5s] Prompt Tease: fully static
+    tease = dim_frame(letterbox_frame(original), -0.3)
+    apply_layer(tease, text_layer("+ inspix Prompt =", 64, 3, lambda h: VIDEO_HEIGHT / 2 - 105))
+    apply_layer(tease, text_layer(prompt_text, 48, 3, lambda h: VIDEO_HEIGHT / 2 + 52))
+    spans += split_timeline(segment_frames(2), fps, still(to_rgb24(tease)), lambda t: "tease")
+
+    # [5-12s] Results Showcase: each clip fades in under its captions, clips are chained with xfade
+    total_duration = 7.0
+    transition_duration = 0.5
+    duration_per_image = showcase_clip_duration(len(results), total_duration, transition_duration)
+    transitions = ["fade", "slideleft", "circleopen", "fadeblack"]
+    step = duration_per_image - transition_duration  # Offset between clip starts
+    captions = [
+        (
+            text_layer(f"Style: {style_names[i]}", 64, 3, lambda h: 105),
+            text_layer(f"{i+1}/{len(results)}", 48, 3, lambda h: VIDEO_HEIGHT - 150),
+        )
+        for i in range(len(results))
+    ]
+
+    def clip_at(i: int, t: float) -> np.ndarray:
+        frame = covers[i] * min(t / 0.3, 1.0)
+        for layer in captions[i]:
+            apply_layer(frame, layer)
+        return frame
+
+    def settled_clip(t: float) -> int:
+        """Latest clip whose incoming transition has finished"""
+        return max(i for i in range(len(results)) if i == 0 or t >= i * step + transition_duration)
+
+    def showcase_at(t: float) -> bytes:
+        current = settled_clip(t)
+        frame = clip_at(current, t - current * step)
+        for i in range(current + 1, len(results)):
+            if t < i * step:
+                break
+            progress = 1 - (t - i * step) / transition_duration
+            frame = xfade_frame(transitions[(i - 1) % len(transitions)], frame, clip_at(i, t - i * step), progress)
+        return to_rgb24(frame)
+
+    def showcase_still(t: float) -> Optional[str]:
+        current = settled_clip(t)
+        if t - current * step < 0.3:
+            return None  # Fading in
+        if current + 1 < len(results) and t >= (current + 1) * step:
+            return None  # Transition to the next clip under way
+        return f"result{current}"
+
+    spans += split_timeline(segment_frames(total_duration), fps, showcase_at, showcase_still)
+
+    # [12-14s] Branding: the dimmed background fades in under the logo, the text fades in on top
+    branding_bg = dim_frame(covers[-1], -0.2)
+    branding_text = text_layer("500+ Prompts Ready", 72, 4, lambda h: (VIDEO_HEIGHT - h) / 2)
+
+    def branding_at(t: float) -> bytes:
+        frame = branding_bg * min(t / 0.5, 1.0)
+        if logo:
+            apply_layer(frame, logo)
+        apply_layer(frame, branding_text, min(t / 0.5, 1.0))
+        return to_rgb24(frame)
+
+    spans += split_timeline(segment_frames(2), fps, branding_at, lambda t: "branding" if t >= 0.5 else None)
+
+    # [14-15s] Call-to-Action: fully static
+    cta = dim_frame(covers[-1], -0.2)
+    if logo:
+        apply_layer(cta, logo)
+    apply_layer(cta, text_layer(cta_text, 80, 4, lambda h: (VIDEO_HEIGHT - h) / 2))
+    spans += split_timeline(segment_frames(1), fps, still(to_rgb24(cta)), lambda t: "cta")
+
+    video_duration = 1 + 2 + 2 + total_duration + 2 + 1
+    return spans, video_duration
+
+def holds_last_frame(spans: List[TimelineSpan]) -> bool:
+    """A final static span needs its frame sent again at its end, or the video would end early"""
+    return bool(spans) and spans[-1].static and spans[-1].frames > 1
+
+async def timeline_frames(spans: List[TimelineSpan]) -> AsyncIterator[bytes]:
+    """rgb24 frames of a timeline: every animated frame, and one frame per static span"""
+    frame = b""
+    for span in spans:
+        if span.static:
+            frame = await asyncio.to_thread(span.render, 0)
+            yield frame
+        else:
+            for n in range(span.frames):
+                frame = await asyncio.to_thread(span.render, n)
+                yield frame
+    if holds_last_frame(spans):
+        yield frame
+
+def timeline_pts(spans: List[TimelineSpan]) -> str:
+    """
+    setpts expression putting the frames from timeline_frames at their output
+    frame numbers: N counts piped frames, the result is in 1/fps units.
+    """
+    # (first piped frame, output frame minus piped frame) of each run with a constant offset
+    runs: List[Tuple[int, int]] = []
+    piped = output = 0
+    for span in spans:
+        if not runs or runs[-1][1] != output - piped:
+            runs.append((piped, output - piped))
+        piped += 1 if span.static else span.frames
+        output += span.frames
+    if holds_last_frame(spans):
+        runs.append((piped, output - 1 - piped))
+
+    expression = f"N+{runs[-1][1]}"
+    for i in range(len(runs) - 1, 0, -1):
+        expression = f"if(lt(N,{runs[i][0]}),N+{runs[i - 1][1]},{expression})"
+    return expression
+
+def build_compositor_command(
+    video_duration: float,
+    pts_expression: str,
+    output_args: List[str],
+    fps: int = 30,
+    music_path: Optional[Path] = None,
+    profile: str = "standard",
+    frame_rate_mode: str = "cfr"
+) -> List[str]:
+    """
+    FFmpeg command encoding rgb24 frames from stdin (plus the audio track) to
+    output_args. Frames are retimed with pts_expression; in "cfr" mode the
+    encoder repeats them to a constant fps, in "vfr" mode each is kept once.
+    """
+    audio_args, audio_bitrate = background_audio_args(music_path)
+    keyint = RENDER_PROFILES[profile]["keyint"]
+    video_filter = f"settb=1/{fps},setpts='{pts_expression}'"
+    if frame_rate_mode == "vfr":
+        # -g counts frames, which are sparse here; keep keyframes spaced in time as well
+        rate_args = ["-fps_mode", "vfr", "-force_key_frames", f"expr:gte(t,n_forced*{keyint})"]
+    else:
+        # The fps filter holds each frame until the next timestamp; the encoder's own
+        # CFR padding would switch to the next frame one frame early
+        video_filter += f",fps={fps}"
+        rate_args = ["-fps_mode", "cfr", "-r", str(fps)]
+    return [
+        "ffmpeg", "-y",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{VIDEO_WIDTH}x{VIDEO_HEIGHT}",
+        "-framerate", str(fps),
+        "-i", "pipe:0",
+    ] + audio_args + [
+        "-map", "0:v",
+        "-map", "1:a:0",
+        "-vf", video_filter,
+        "-c:v", "libx264",
+        "-c:a", "aac",
+        "-b:a", audio_bitrate,
+        "-pix_fmt", "yuv420p",
+    ] + get_profile_encoding_flags(fps, profile) + rate_args + [
+        "-t", f"{video_duration:.3f}",
+    ] + get_high_quality_ffmpeg_flags(profile) + output_args
+
+async def create_inspix_video_compositor(
+    original_image: Path,
+    result_images: List[Path],
+    output_path: Path,
+    prompt_text: Optional[str] = None,
+    style_names: Optional[List[str]] = None,
+    logo_path: Optional[Path] = None,
+    cta_text: str = "Link in Bio 👆",
+    fps: int = 30,
+    music_path: Optional[Path] = None,
+    profile: str = "standard"
+) -> bool:
+    """
+    Render the inspix timeline by compositing frames in Pillow/NumPy and
+    piping them as rawvideo into one libx264 process. No filter graph and no
+    intermediate files; each distinct still frame is built and sent once.
+    """
+    try:
+        logger.info("Creating inspix video with the frame compositor")
+
+        if not prompt_text:
+            prompt_text = auto_generate_prompt_preview(len(result_images))
+        if not style_names or len(style_names) < len(result_images):
+            style_names = [f"Style {i+1}" for i in range(len(result_images))]
+        if logo_path and not logo_path.exists():
+            logo_path = None
+
+        spans, video_duration = await asyncio.to_thread(
+            build_compositor_timeline,
+            original_image, result_images, prompt_text, style_names, logo_path, cta_text, fps
+        )
+        animated = sum(span.frames for span in spans if not span.static)
+        logger.info(
+            f"Compositor timeline: {len(spans)} spans, {animated} animated frames, "
+            f"{INSPIX_FRAME_RATE_MODE.upper()} output"
+        )
+
+        cmd = build_compositor_command(
+            video_duration,
+            timeline_pts(spans),
+            ["-movflags", "+faststart", str(output_path)],
+            fps,
+            music_path,
+            profile,
+            INSPIX_FRAME_RATE_MODE
+        )
+        with progress_stage("render"):
+            result = await run_ffmpeg(cmd, timeout=VIDEO_TIMEOUT, stdin=timeline_frames(spans))
+
+        if result.returncode != 0:
+            logger.error(f"Compositor render failed: {result.stderr}")
+            return False
+
+        # Verify output
+        if not output_path.exists() or output_path.stat().st_size < 10000:
+            logger.error("Output video file is missing or too small")
+            return False
+
+        file_size_mb = output_path.stat().st_size / (1024 * 1024)
+        logger.info(f"Video created successfully: {file_size_mb:.2f} MB ({video_duration:.2f}s timeline)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error creating compositor inspix video: {e}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return False
+
+def build_audio_mux_command(video_path: Path, audio_path: Optional[Path], output_args: List[str]) -> List[str]:
+    """FFmpeg command that copies the video stream and muxes in (looped) audio when given"""
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", str(video_path),
+    ]
+    if audio_path:
+        cmd += [
             "-stream_loop", "-1",  # Loop audio indefinitely - moved before audio input
             "-i", str(audio_path),
             "-c:v", "copy",
@@ -1309,11 +3530,21 @@ def add_audio_to_video(video_path: Path, audio_path: Path, output_path: Path) ->
             "-shortest",  # End when video (longest stream) ends
             "-map", "0:v:0",  # Video from first input
             "-map", "1:a:0",  # Audio from second input
-            "-movflags", "+faststart",
-            str(output_path)
         ]
+    else:
+        cmd += ["-c", "copy"]
+    return cmd + output_args
+
+async def add_audio_to_video(video_path: Path, audio_path: Path, output_path: Path) -> bool:
+    """Add audio track to video"""
+    try:
+        cmd = build_audio_mux_command(
+            video_path,
+            audio_path,
+            ["-movflags", "+faststart", str(output_path)]
+        )
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        result = await run_ffmpeg(cmd, timeout=300)
         if result.returncode != 0:
             logger.error(f"Error adding audio: {result.stderr}")
             return False
@@ -1323,10 +3554,194 @@ def add_audio_to_video(video_path: Path, audio_path: Path, output_path: Path) ->
         logger.error(f"Error adding audio: {e}")
         return False
 
+class VideoFileResponse(Response):
+    """
+    Sends bytes [start, end] of an already open file in chunks read off the
+    event loop, and closes it. uvicorn has no zero-copy send; set
+    DOWNLOAD_ACCEL_REDIRECT_PREFIX to have nginx sendfile the body instead.
+    """
+
+    def __init__(self, file: BinaryIO, start: int, end: int, status_code: int, headers: Dict[str, str]):
+        super().__init__(status_code=status_code, headers=headers, media_type="video/mp4")
+        self.file = file
+        self.start = start
+        self.end = end
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope, receive, send) -> None:
+        with self.file as file:
+            await send({
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            })
+            if scope["method"].upper() == "HEAD":
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+
+            count = self.end - self.start + 1
+            file.seek(self.start)
+            more_body = True
+            while more_body:
+                chunk = await asyncio.to_thread(file.read, min(DOWNLOAD_SEND_CHUNK_SIZE, count)) if count > 0 else b""
+                count -= len(chunk)
+                # A short read means the file shrank underneath us; end the body rather than hang the client
+                more_body = bool(chunk) and count > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end). Returns None when
+    the header should be ignored (malformed or multiple ranges) and raises 416
+    when the range lies outside the file.
+    """
+    match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", range_header)
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def last_modified_in_tree(path: Path) -> float:
+    """Newest mtime of a file, or of a directory and everything under it"""
+    newest = path.stat().st_mtime
+    if path.is_dir():
+        for root, dirs, files in os.walk(path):
+            for name in dirs + files:
+                try:
+                    newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+                except FileNotFoundError:
+                    continue
+    return newest
+
+class Janitor:
+    """
+    Background sweeper for the disk the render paths leave behind. Each sweep
+    deletes outputs not downloaded for OUTPUT_MAX_AGE, then the least recently
+    downloaded outputs until OUTPUT_DIR fits OUTPUT_MAX_BYTES, then scratch
+    files, cache partials and request workspaces left untouched for
+    STALE_WORKSPACE_AGE (the leftovers of a crashed or killed render). Sweeps
+    run in a worker thread.
+    """
+
+    def __init__(self, max_age: int, max_bytes: int, stale_age: int):
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stale_age = stale_age
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {
+            "sweeps": 0,
+            "outputs_expired": 0,
+            "outputs_evicted": 0,
+            "workspaces_removed": 0,
+            "bytes_freed": 0,
+            "output_bytes": 0,
+            "last_sweep_seconds": 0.0,
+        }
+
+    def sweep(self) -> None:
+        """One pass over OUTPUT_DIR, the cache scratch areas and UPLOAD_DIR (blocking)"""
+        started = time.monotonic()
+        now = time.time()
+
+        # Outputs are ranked by their last download; /download bumps the atime
+        outputs = []
+        for path in OUTPUT_DIR.glob("*.mp4"):
+            if not path.name.startswith(OUTPUT_PREFIXES):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            outputs.append((max(stat.st_atime, stat.st_mtime), stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, _, size, _ in outputs)
+        for last_used, modified, size, path in sorted(outputs):
+            expired = self.max_age and now - last_used > self.max_age
+            over_quota = self.max_bytes and total > self.max_bytes and now - modified > OUTPUT_MIN_AGE
+            if not (expired or over_quota):
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats["bytes_freed"] += size
+            self.stats["outputs_expired" if expired else "outputs_evicted"] += 1
+            logger.info(f"Janitor removed output {path.name} ({'expired' if expired else 'over quota'})")
+        self.stats["output_bytes"] = total
+
+        # Scratch and cache partials left by renders that never reached their own cleanup
+        scratch_dirs = (OUTPUT_DIR, SEGMENT_CACHE_DIR, IMAGE_CACHE_DIR, download_cache.blob_dir, RESULT_CACHE_DIR)
+        leftovers = [
+            path
+            for directory in scratch_dirs
+            if directory.is_dir()
+            for path in directory.iterdir()
+            if path.name.startswith(SCRATCH_PREFIXES) or ".part" in path.suffixes
+        ]
+        leftovers += list(UPLOAD_DIR.iterdir())
+        for path in leftovers:
+            try:
+                if now - last_modified_in_tree(path) <= self.stale_age:
+                    continue
+            except FileNotFoundError:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+            self.stats["workspaces_removed"] += 1
+            logger.info(f"Janitor removed stale workspace {path}")
+
+        self.stats["sweeps"] += 1
+        self.stats["last_sweep_seconds"] = round(time.monotonic() - started, 3)
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Janitor sweep failed: {e}")
+            await asyncio.sleep(interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, max_age=self.max_age, max_bytes=self.max_bytes)
+
+janitor = Janitor(OUTPUT_MAX_AGE, OUTPUT_MAX_BYTES, STALE_WORKSPACE_AGE)
+
+@app.on_event("startup")
+async def start_janitor():
+    """Sweep right away, then every JANITOR_INTERVAL"""
+    janitor.task = asyncio.create_task(janitor.run(JANITOR_INTERVAL))
+
+@app.on_event("shutdown")
+async def stop_janitor():
+    """Cancel the janitor (a sweep already in its thread finishes on its own)"""
+    if janitor.task:
+        janitor.task.cancel()
+        await asyncio.gather(janitor.task, return_exceptions=True)
+        janitor.task = None
+
 @app.get("/")
 async def root():
     """API health check"""
-    ffmpeg_available = check_ffmpeg()
+    ffmpeg_available = ffmpeg_capabilities.usable()
     return {
         "message": "FFmpeg Video Generator API",
         "status": "running",
@@ -1334,44 +3749,65 @@ async def root():
         "version": "1.0.0"
     }
 
+class StatsCollector:
+    """Exports the counters already reported on /health as Prometheus gauges"""
+
+    def __init__(self, sources: Dict[str, Callable[[], Dict[str, Any]]]):
+        self.sources = sources
+
+    def describe(self) -> list:
+        return []
+
+    def collect(self):
+        for prefix, get_stats in self.sources.items():
+            for key, value in get_stats().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"inspix_{prefix}_{key}", f"{prefix} {key.replace('_', ' ')}", value=value)
+
+REGISTRY.register(StatsCollector({
+    "http_pool": get_http_pool_stats,
+    "download_cache": lambda: download_cache.get_stats(),
+    "segment_cache": lambda: segment_cache.get_stats(),
+    "result_cache": lambda: result_cache.get_stats(),
+    "ffmpeg_threads": lambda: thread_allocator.get_stats(),
+    # In-flight renders, waiting requests and job queue depth
+    "render_admission": lambda: render_admission.get_stats(),
+    "janitor": lambda: janitor.get_stats(),
+}))
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+@app.post("/admin/ffmpeg/refresh")
+async def refresh_ffmpeg_capabilities(x_admin_token: Optional[str] = Header(None)):
+    """Re-probe FFmpeg (e.g. after an upgrade or installing fonts) and return the new registry"""
+    if ADMIN_TOKEN and not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    await asyncio.to_thread(ffmpeg_capabilities.probe)
+    return ffmpeg_capabilities.snapshot()
+
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "ffmpeg": check_ffmpeg(),
+        "ffmpeg": ffmpeg_capabilities.usable(),
+        "ffmpeg_capabilities": ffmpeg_capabilities.snapshot(),
         "upload_dir": UPLOAD_DIR.exists(),
-        "output_dir": OUTPUT_DIR.exists()
+        "output_dir": OUTPUT_DIR.exists(),
+        "http_pool": get_http_pool_stats(),
+        "download_cache": download_cache.get_stats(),
+        "segment_cache": segment_cache.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        "ffmpeg_threads": thread_allocator.get_stats(),
+        "render_admission": render_admission.get_stats(),
+        "janitor": janitor.get_stats()
     }
 
-@app.post("/generate-inspix-video")
-async def generate_inspix_video(request: VideoGenerationRequest):
-    """
-    Generate a 15-second Instagram-ready video following the inspix timeline:
-    [0-1s] Hook Grid - 2x2 grid of results with quick zooms
-    [1-3s] Original Photo - Display with text overlay
-    [3-5s] Prompt Tease - Show prompt text with original dimmed
-    [5-12s] Results Showcase - Sequential display with transitions
-    [12-14s] Branding - Show branding message with logo
-    [14-15s] Call-to-Action - Display CTA text
-
-    Technical Specs (HIGH QUALITY):
-    - Resolution: 1080x1920 (Full HD 9:16 portrait)
-    - Frame Rate: 30fps (smooth playback)
-    - Codec: H.264 (libx264, medium preset, CRF 18 - near lossless quality)
-    - Audio: Background music (128k AAC) if music_url provided, otherwise silent AAC track 64k
-    - Duration: Exactly 15 seconds
-    - Max Images: 4 result images
-    - Max File Size: 10MB per image/audio
-    - Bitrate: Up to 8M for high quality
-    - Buffer Size: 2M for smooth encoding
-    - Background Music: Optional music_url parameter for custom background music (will be looped to match video duration)
-    """
-
-    # Check FFmpeg availability
-    if not check_ffmpeg():
-        raise HTTPException(status_code=503, detail="FFmpeg not available")
-
+def validate_inspix_request(request: VideoGenerationRequest) -> None:
+    """Validate an inspix request, raising HTTPException on invalid input"""
     # Validate inputs
     if not request.original_image_url:
         raise HTTPException(
@@ -1424,151 +3860,362 @@ async def generate_inspix_video(request: VideoGenerationRequest):
             detail=f"style_names count ({len(request.style_names)}) must match result_image_urls count ({len(request.result_image_urls)})"
         )
 
-    # Generate unique ID for this request
-    request_id = str(uuid.uuid4())
-    request_dir = UPLOAD_DIR / request_id
-    request_dir.mkdir(exist_ok=True)
+    if request.render_engine and request.render_engine not in RENDER_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"render_engine must be one of: {', '.join(sorted(RENDER_ENGINES))}"
+        )
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            # Download original image
-            logger.info(f"Downloading original image from: {request.original_image_url}")
-            extension = get_image_extension_from_url(request.original_image_url)
-            original_image_path = request_dir / f"original{extension}"
+    if request.render_profile and request.render_profile not in RENDER_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"render_profile must be one of: {', '.join(RENDER_PROFILES)}"
+        )
+
+class ResultCache:
+    """
+    Maps a canonical request hash to a finished render in OUTPUT_DIR. Entries
+    are small JSON files holding the response payload, and an entry whose
+    video has since been deleted counts as a miss. Identical requests that
+    arrive while the first is still running attach to it instead of starting
+    their own FFmpeg pipelines.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.inflight: Dict[str, Tuple[Optional[str], asyncio.Future]] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry_path = self.directory / f"{key}.json"
+        try:
+            async with aiofiles.open(entry_path, "r") as f:
+                entry = json.loads(await f.read())
+        except (OSError, ValueError):
+            return None
+
+        output_filename = Path(entry["response"]["download_url"]).name
+        if not (OUTPUT_DIR / output_filename).exists():
+            entry_path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    async def store(self, key: str, entry: Dict[str, Any]) -> None:
+        entry_path = self.directory / f"{key}.json"
+        partial = entry_path.with_name(f"{entry_path.name}.{uuid.uuid4().hex[:8]}.part")
+        async with aiofiles.open(partial, "w") as f:
+            await f.write(json.dumps(entry))
+        os.replace(partial, entry_path)
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the cached response for key, or await `compute()` once for all
+        concurrent callers. A fingerprint that differs from the one the key was
+        first used with is rejected (Idempotency-Key reuse).
+        """
+        entry = await self.lookup(key)
+        if entry is not None:
+            if entry.get("fingerprint") != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+            self.stats["hits"] += 1
+            logger.info(f"Result cache hit: {key[:16]}")
+            return dict(entry["response"], cached=True)
+
+        if key in self.inflight:
+            inflight_fingerprint, task = self.inflight[key]
+            if inflight_fingerprint != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+            self.stats["coalesced"] += 1
+            logger.info(f"Attaching to in-flight render: {key[:16]}")
+            return dict(await asyncio.shield(task), cached=True)
+
+        self.stats["misses"] += 1
+        task = asyncio.ensure_future(self._compute(key, compute, fingerprint))
+        self.inflight[key] = (fingerprint, task)
+        task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        response = await asyncio.shield(task)
+        return dict(response, cached=response.get("cached", False))
+
+    async def _compute(self, key: str, compute: Callable[[], Any], fingerprint: Optional[str]) -> Dict[str, Any]:
+        response = await compute()
+        await self.store(key, {"fingerprint": fingerprint, "response": response})
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, inflight=len(self.inflight))
+
+result_cache = ResultCache(RESULT_CACHE_DIR)
+
+def inspix_payload(request: VideoGenerationRequest) -> Dict[str, Any]:
+    """Request fields that shape the rendered video, with defaults resolved"""
+    payload = request.model_dump()
+    payload["render_engine"] = request.render_engine or DEFAULT_RENDER_ENGINE
+    payload["render_profile"] = request.render_profile or DEFAULT_RENDER_PROFILE
+    if payload["render_engine"] == "compositor":
+        payload["frame_rate_mode"] = INSPIX_FRAME_RATE_MODE
+    return payload
+
+def canonical_hash(payload: Dict[str, Any]) -> str:
+    """Stable hash of a JSON-serializable payload"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+async def process_inspix_request(
+    request: VideoGenerationRequest,
+    request_id: str,
+    idempotency_key: Optional[str] = None,
+    queued: bool = False
+) -> Dict[str, Any]:
+    """
+    Render the inspix video, replaying the stored response for a repeated
+    Idempotency-Key. A render slot is only taken once both caches miss;
+    queued=True marks a job worker (see RenderAdmission.acquire).
+    """
+    if not idempotency_key:
+        return await render_inspix_request(request, request_id, queued)
+
+    return await result_cache.run(
+        f"idempotency_{canonical_hash({'idempotency_key': idempotency_key})}",
+        lambda: render_inspix_request(request, request_id, queued),
+        fingerprint=canonical_hash(inspix_payload(request))
+    )
+
+async def render_downloaded_assets(
+    request: VideoGenerationRequest,
+    request_id: str,
+    original_image_path: Path,
+    result_image_paths: List[Path],
+    logo_path: Optional[Path],
+    music_path: Optional[Path]
+) -> Dict[str, Any]:
+    """Render the inspix video from downloaded assets and build the response"""
+    # Generate output video
+    output_filename = f"inspix_{request_id}.mp4"
+    output_path = OUTPUT_DIR / output_filename
+
+    render_engine = request.render_engine or DEFAULT_RENDER_ENGINE
+    render = {
+        "segments": create_inspix_video,
+        "single_pass": create_inspix_video_single_pass,
+        "compositor": create_inspix_video_compositor,
+    }[render_engine]
+    render_profile = request.render_profile or DEFAULT_RENDER_PROFILE
+    profile_settings = RENDER_PROFILES[render_profile]
+
+    logger.info(f"Starting video generation ({render_profile} profile, {render_engine} engine)")
+    started = time.monotonic()
+    success = await render(
+        original_image=original_image_path,
+        result_images=result_image_paths,
+        output_path=output_path,
+        prompt_text=request.prompt_preview_text,
+        style_names=request.style_names,
+        logo_path=logo_path,
+        cta_text=request.custom_cta_text,
+        fps=30,  # High quality smooth playback
+        music_path=music_path,
+        profile=render_profile
+    )
+
+    if not success:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate video"
+        )
+    RENDER_SECONDS.labels(engine=render_engine, profile=render_profile).observe(time.monotonic() - started)
+
+    gc.collect()
+
+    if not output_path.exists():
+        raise HTTPException(
+            status_code=500,
+            detail="Video file was not created"
+        )
+
+    # Get video info
+    file_size = output_path.stat().st_size
+    file_size_mb = file_size / (1024 * 1024)
+
+    # Return success response
+    return {
+        "message": "Inspix video created successfully (HIGH QUALITY)",
+        "video_id": request_id,
+        "download_url": f"/download/{output_filename}",
+        "file_size": file_size,
+        "file_size_mb": round(file_size_mb, 2),
+        "duration_seconds": 15,
+        "resolution": "1080x1920",
+        "fps": 30,
+        "frame_rate_mode": INSPIX_FRAME_RATE_MODE if render_engine == "compositor" else "cfr",
+        "format": "mp4",
+        "codec": f"H.264 (CRF {profile_settings['crf']} - {profile_settings['label']})",
+        "preset": profile_settings["preset"],
+        "render_engine": render_engine,
+        "render_profile": render_profile,
+        "audio": "AAC 128k (background music)" if music_path else "AAC 64k (silent)",
+        "background_music_added": music_path is not None,
+        "images_processed": {
+            "original": 1,
+            "results": len(result_image_paths),
+            "logo": 1 if logo_path else 0
+        },
+        "quality": "High Quality Full HD"
+    }
+
+async def download_inspix_assets(
+    request: VideoGenerationRequest,
+    request_dir: Path
+) -> Tuple[Path, List[Path], Optional[Path], Optional[Path]]:
+    """
+    Download the request assets into request_dir. Returns (original image,
+    result images, logo or None, music or None); raises HTTPException when a
+    required image fails.
+    """
+    session = get_http_session()
+    # All assets are fetched concurrently, at most DOWNLOAD_CONCURRENCY at a time.
+    # A failed required image cancels the remaining downloads.
+    download_slots = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
 
+    async def download_required_image(url: str, destination: Path, label: str, asset_type: str) -> Path:
+        async with download_slots:
             result = await download_image_from_url(
                 session,
-                request.original_image_url,
-                original_image_path,
-                validate_dimensions=True
+                url,
+                destination,
+                validate_dimensions=True,
+                asset_type=asset_type
             )
 
-            if not result.get("success"):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to download original image: {result.get('error', 'Unknown error')}"
-                )
-
-            # Download result images
-            result_image_paths = []
-            logger.info(f"Downloading {len(request.result_image_urls)} result images")
+        if not result.get("success"):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to download {label}: {result.get('error', 'Unknown error')}"
+            )
+        return destination
 
-            for i, url in enumerate(request.result_image_urls):
-                extension = get_image_extension_from_url(url)
-                result_path = request_dir / f"result_{i:04d}{extension}"
+    async def download_logo() -> Optional[Path]:
+        logger.info(f"Downloading logo from: {request.logo_url}")
+        extension = get_image_extension_from_url(request.logo_url)
+        logo_path = request_dir / f"logo{extension}"
 
-                result = await download_image_from_url(
-                    session,
-                    url,
-                    result_path,
-                    validate_dimensions=True
-                )
+        async with download_slots:
+            result = await download_image_from_url(session, request.logo_url, logo_path, asset_type="logo")
 
-                if not result.get("success"):
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Failed to download result image {i+1}: {result.get('error', 'Unknown error')}"
-                    )
+        if not result.get("success"):
+            logger.warning(f"Failed to download logo: {result.get('error')}. Continuing without logo.")
+            return None
+        return logo_path
 
-                result_image_paths.append(result_path)
+    async def download_music() -> Optional[Path]:
+        logger.info(f"Downloading background music from: {request.music_url}")
+        extension = get_audio_extension_from_url(request.music_url)
+        music_path = request_dir / f"music{extension}"
 
-            # Force garbage collection after downloading images
-            gc.collect()
+        async with download_slots:
+            success = await download_audio_from_url(session, request.music_url, music_path, asset_type="music")
 
-            # Download logo if provided
-            logo_path = None
-            if request.logo_url:
-                logger.info(f"Downloading logo from: {request.logo_url}")
-                extension = get_image_extension_from_url(request.logo_url)
-                logo_path = request_dir / f"logo{extension}"
-
-                result = await download_image_from_url(session, request.logo_url, logo_path)
-
-                if not result.get("success"):
-                    logger.warning(f"Failed to download logo: {result.get('error')}. Continuing without logo.")
-                    logo_path = None
-
-            # Download background music if provided
-            music_path = None
-            if request.music_url:
-                logger.info(f"Downloading background music from: {request.music_url}")
-                extension = get_audio_extension_from_url(request.music_url)
-                music_path = request_dir / f"music{extension}"
-
-                success = await download_audio_from_url(session, request.music_url, music_path)
-
-                if not success:
-                    logger.warning(f"Failed to download music. Continuing without background music.")
-                    music_path = None
-
-        # Generate output video
-        output_filename = f"inspix_{request_id}.mp4"
-        output_path = OUTPUT_DIR / output_filename
-
-        logger.info("Starting video generation (high quality mode)")
-        success = create_inspix_video(
-            original_image=original_image_path,
-            result_images=result_image_paths,
-            output_path=output_path,
-            prompt_text=request.prompt_preview_text,
-            style_names=request.style_names,
-            logo_path=logo_path,
-            cta_text=request.custom_cta_text,
-            fps=30,  # High quality smooth playback
-            music_path=music_path
+        if not success:
+            logger.warning(f"Failed to download music. Continuing without background music.")
+            return None
+        return music_path
+
+    async def skip() -> None:
+        return None
+
+    logger.info(f"Downloading original image and {len(request.result_image_urls)} result images")
+    extension = get_image_extension_from_url(request.original_image_url)
+    downloads = [
+        download_required_image(
+            request.original_image_url,
+            request_dir / f"original{extension}",
+            "original image",
+            "original"
         )
+    ]
+    for i, url in enumerate(request.result_image_urls):
+        extension = get_image_extension_from_url(url)
+        downloads.append(download_required_image(
+            url,
+            request_dir / f"result_{i:04d}{extension}",
+            f"result image {i+1}",
+            "result"
+        ))
+    downloads.append(download_logo() if request.logo_url else skip())
+    downloads.append(download_music() if request.music_url else skip())
+
+    downloaded = await gather_or_cancel(*downloads)
+    return downloaded[0], downloaded[1:-2], downloaded[-2], downloaded[-1]
+
+async def render_inspix_request(
+    request: VideoGenerationRequest,
+    request_id: str,
+    queued: bool = False
+) -> Dict[str, Any]:
+    """Download the request assets, render the inspix video and build the response"""
+    request_dir = UPLOAD_DIR / request_id
+    request_dir.mkdir(exist_ok=True)
+    plan_render_progress(request.render_engine or DEFAULT_RENDER_ENGINE)
 
-        if not success:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to generate video"
+    try:
+        with progress_stage("download"):
+            original_image_path, result_image_paths, logo_path, music_path = await download_inspix_assets(
+                request, request_dir
             )
 
-        # Clean up downloaded files and force garbage collection
-        shutil.rmtree(request_dir, ignore_errors=True)
+        # Force garbage collection after downloading images
         gc.collect()
 
-        if not output_path.exists():
-            raise HTTPException(
-                status_code=500,
-                detail="Video file was not created"
-            )
+        # Identical payloads over identical asset content render identical videos, so the
+        # result cache key swaps the asset URLs for the hashes of what they resolved to
+        payload = inspix_payload(request)
+        for field in ("original_image_url", "result_image_urls", "logo_url", "music_url"):
+            payload.pop(field)
+        payload["assets"] = {
+            "original": await file_sha256(original_image_path),
+            "results": [await file_sha256(path) for path in result_image_paths],
+            "logo": await file_sha256(logo_path) if logo_path else None,
+            "music": await file_sha256(music_path) if music_path else None,
+        }
+        payload["version"] = [SEGMENT_CACHE_VERSION, RESULT_CACHE_VERSION]
+        payload["font"] = drawtext_font()
+
+        async def render_video() -> Dict[str, Any]:
+            try:
+                # Only a result cache miss renders, so only a miss needs a render slot
+                async with render_admission.slot(queued):
+                    return await render_downloaded_assets(
+                        request,
+                        request_id,
+                        original_image_path,
+                        result_image_paths,
+                        logo_path,
+                        music_path
+                    )
+            finally:
+                # Runs even if the submitting client went away mid-render
+                await remove_directory(request_dir)
 
-        # Get video info
-        file_size = output_path.stat().st_size
-        file_size_mb = file_size / (1024 * 1024)
+        response = await result_cache.run(canonical_hash(payload), render_video)
 
-        # Return success response
-        return {
-            "message": "Inspix video created successfully (HIGH QUALITY)",
-            "video_id": request_id,
-            "download_url": f"/download/{output_filename}",
-            "file_size": file_size,
-            "file_size_mb": round(file_size_mb, 2),
-            "duration_seconds": 15,
-            "resolution": "1080x1920",
-            "fps": 30,
-            "format": "mp4",
-            "codec": "H.264 (CRF 18 - Near Lossless)",
-            "preset": "medium",
-            "audio": "AAC 128k (background music)" if music_path else "AAC 64k (silent)",
-            "background_music_added": music_path is not None,
-            "images_processed": {
-                "original": 1,
-                "results": len(result_image_paths),
-                "logo": 1 if logo_path else 0
-            },
-            "quality": "High Quality Full HD"
-        }
+        # Clean up downloaded files and force garbage collection
+        await remove_directory(request_dir)
+        gc.collect()
+
+        return response
 
     except HTTPException:
         # Clean up on error and free memory
-        shutil.rmtree(request_dir, ignore_errors=True)
+        await remove_directory(request_dir)
         gc.collect()
         raise
     except Exception as e:
         # Clean up on error and free memory
-        shutil.rmtree(request_dir, ignore_errors=True)
+        await remove_directory(request_dir)
         gc.collect()
         logger.error(f"Unexpected error: {e}")
         import traceback
@@ -1578,30 +4225,428 @@ async def generate_inspix_video(request: VideoGenerationRequest):
             detail=f"Internal server error: {str(e)}"
         )
 
+async def stream_inspix_request(request: VideoGenerationRequest, request_id: str) -> StreamingResponse:
+    """
+    Download the request assets and stream the single-pass render as
+    fragmented MP4 while it encodes. Nothing is written to OUTPUT_DIR.
+    """
+    # The render slot is held until the stream finishes, not just until the response starts
+    release_slot = await render_admission.acquire()
+    request_dir = UPLOAD_DIR / request_id
+    request_dir.mkdir(exist_ok=True)
+
+    async def cleanup() -> None:
+        release_slot()
+        await remove_directory(request_dir)
+
+    try:
+        original_image_path, result_image_paths, logo_path, music_path = await download_inspix_assets(
+            request, request_dir
+        )
+        gc.collect()
+
+        fps = 30
+        cmd, _ = build_single_pass_command(
+            original_image_path,
+            result_image_paths,
+            # A keyframe, and so a fragment, every second keeps time-to-first-byte low
+            ["-g", str(fps)] + fragmented_mp4_output(),
+            request.prompt_preview_text,
+            request.style_names,
+            logo_path,
+            request.custom_cta_text,
+            fps,
+            music_path,
+            request.render_profile or DEFAULT_RENDER_PROFILE
+        )
+
+        logger.info("Streaming single-pass inspix render")
+        return await streaming_video_response(
+            cmd,
+            VIDEO_TIMEOUT,
+            f"inspix_{request_id}.mp4",
+            cleanup,
+            headers={"X-Video-Id": request_id}
+        )
+
+    except HTTPException:
+        await cleanup()
+        raise
+    except Exception as e:
+        await cleanup()
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+# In-memory render job registry, drained by a bounded pool of render workers
+render_jobs: Dict[str, Dict[str, Any]] = {}
+render_job_queue: Optional[asyncio.Queue] = None
+render_workers: List[asyncio.Task] = []
+render_job_keys: Dict[str, str] = {}  # Idempotency-Key -> job id
+
+class RenderAdmission:
+    """
+    Caps how many renders run at once across the synchronous endpoints and the
+    job workers. Up to max_waiting synchronous callers may wait for a slot;
+    anyone beyond that is turned away at once with 429 and a Retry-After
+    estimated from the wait queue and recent render times. Job workers waiting
+    for a slot are counted apart and do not use up that budget.
+    """
+
+    def __init__(self, max_running: int, max_waiting: int):
+        self.max_running = max_running
+        self.max_waiting = max_waiting
+        self.slots = asyncio.Semaphore(max_running)
+        self.running = 0
+        self.waiting = 0  # Synchronous callers only
+        self.queued_waiting = 0  # Job workers
+        self.render_times: deque = deque(maxlen=RENDER_TIME_WINDOW)
+        self.stats = {"admitted": 0, "rejected": 0}
+
+    def average_render_time(self) -> float:
+        if not self.render_times:
+            return DEFAULT_RENDER_SECONDS
+        return sum(self.render_times) / len(self.render_times)
+
+    def retry_after(self, ahead: int) -> int:
+        """Seconds until a caller with `ahead` renders in front of it would likely start"""
+        return max(1, math.ceil(self.average_render_time() * (ahead + 1) / self.max_running))
+
+    async def acquire(self, queued: bool = False) -> Callable[[], None]:
+        """
+        Wait for a render slot and return an idempotent release callback. Job
+        workers pass queued=True: their backlog is the job queue, so they are
+        never rejected.
+        """
+        if not queued and self.slots.locked() and self.waiting >= self.max_waiting:
+            self.stats["rejected"] += 1
+            retry_after = self.retry_after(self.waiting)
+            logger.warning(f"Rejecting render: {self.running} running, {self.waiting} waiting (retry in {retry_after}s)")
+            raise HTTPException(
+                status_code=429,
+                detail="Server is at render capacity, try again later",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+        counter = "queued_waiting" if queued else "waiting"
+        setattr(self, counter, getattr(self, counter) + 1)
+        try:
+            await self.slots.acquire()
+        finally:
+            setattr(self, counter, getattr(self, counter) - 1)
+
+        self.running += 1
+        self.stats["admitted"] += 1
+        started = time.monotonic()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self.running -= 1
+            self.slots.release()
+            self.render_times.append(time.monotonic() - started)
+
+        return release
+
+    @asynccontextmanager
+    async def slot(self, queued: bool = False):
+        release = await self.acquire(queued)
+        try:
+            yield
+        finally:
+            release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent_renders": self.max_running,
+            "max_waiting": self.max_waiting,
+            "running": self.running,
+            "waiting": self.waiting,
+            "jobs_waiting": self.queued_waiting,
+            "job_queue_depth": render_job_queue.qsize() if render_job_queue else 0,
+            "job_queue_size": RENDER_QUEUE_SIZE,
+            "average_render_seconds": round(self.average_render_time(), 1),
+            **self.stats,
+        }
+
+render_admission = RenderAdmission(MAX_CONCURRENT_RENDERS, RENDER_WAIT_QUEUE_SIZE)
+
+def prune_render_jobs() -> None:
+    """Drop the oldest finished jobs once the history limit is exceeded"""
+    finished = [job for job in render_jobs.values() if job["status"] in ("completed", "failed")]
+    excess = len(finished) - RENDER_JOB_HISTORY
+    if excess <= 0:
+        return
+    finished.sort(key=lambda job: job["finished_at"])
+    for job in finished[:excess]:
+        render_jobs.pop(job["job_id"], None)
+        if job["idempotency_key"]:
+            render_job_keys.pop(job["idempotency_key"], None)
+
+async def render_worker(worker_id: int) -> None:
+    """Pull inspix jobs off the queue and render them one at a time"""
+    while True:
+        job_id, request = await render_job_queue.get()
+        job = render_jobs.get(job_id)
+        try:
+            if job is None:
+                continue
+
+            logger.info(f"Render worker {worker_id} picked up job {job_id}")
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            job["progress"] = RenderProgress()
+            progress_token = render_progress_var.set(job["progress"])
+
+            try:
+                job["result"] = await process_inspix_request(request, job_id, job["idempotency_key"], queued=True)
+                job["status"] = "completed"
+            except HTTPException as e:
+                job["status"] = "failed"
+                job["error"] = e.detail
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                job["status"] = "failed"
+                job["error"] = f"Internal server error: {str(e)}"
+            finally:
+                render_progress_var.reset(progress_token)
+
+            job["finished_at"] = time.time()
+            logger.info(f"Job {job_id} {job['status']} in {job['finished_at'] - job['started_at']:.1f}s")
+            prune_render_jobs()
+        finally:
+            render_job_queue.task_done()
+
+@app.on_event("startup")
+async def start_render_workers():
+    """Create the job queue and spawn the render worker pool"""
+    global render_job_queue
+    render_job_queue = asyncio.Queue(maxsize=RENDER_QUEUE_SIZE)
+    for worker_id in range(RENDER_WORKERS):
+        render_workers.append(asyncio.create_task(render_worker(worker_id)))
+    logger.info(f"Started {RENDER_WORKERS} render workers (queue size {RENDER_QUEUE_SIZE})")
+
+@app.on_event("shutdown")
+async def stop_render_workers():
+    """Cancel the render worker pool"""
+    for worker in render_workers:
+        worker.cancel()
+    await asyncio.gather(*render_workers, return_exceptions=True)
+    render_workers.clear()
+
+def serialize_render_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the public status payload for a render job"""
+    payload = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "status_url": f"/jobs/{job['job_id']}",
+    }
+    if job["status"] == "queued":
+        payload["queue_depth"] = render_job_queue.qsize() if render_job_queue else 0
+    if job["status"] == "running" and job.get("progress"):
+        payload["progress"] = job["progress"].snapshot()
+    if job["status"] == "completed":
+        payload["result"] = job["result"]
+    if job["status"] == "failed":
+        payload["error"] = job["error"]
+    return payload
+
+@app.post("/generate-inspix-video")
+async def generate_inspix_video(
+    request: VideoGenerationRequest,
+    stream: bool = False,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    Generate a 15-second Instagram-ready video following the inspix timeline:
+    [0-1s] Hook Grid - 2x2 grid of results with quick zooms
+    [1-3s] Original Photo - Display with text overlay
+    [3-5s] Prompt Tease - Show prompt text with original dimmed
+    [5-12s] Results Showcase - Sequential display with transitions
+    [12-14s] Branding - Show branding message with logo
+    [14-15s] Call-to-Action - Display CTA text
+
+    Technical Specs (HIGH QUALITY):
+    - Resolution: 1080x1920 (Full HD 9:16 portrait)
+    - Frame Rate: 30fps (smooth playback)
+    - Codec: H.264 (libx264, medium preset, CRF 18 - near lossless quality)
+    - Audio: Background music (128k AAC) if music_url provided, otherwise silent AAC track 64k
+    - Duration: Exactly 15 seconds
+    - Max Images: 4 result images
+    - Max File Size: 10MB per image/audio
+    - Bitrate: Up to 8M for high quality
+    - Buffer Size: 2M for smooth encoding
+    - Background Music: Optional music_url parameter for custom background music (will be looped to match video duration)
+
+    Identical requests (same payload and asset content) reuse the earlier video and
+    report "cached": true. Retries that send the same Idempotency-Key header get the
+    original response back without re-downloading anything.
+
+    With ?stream=true the single-pass render is streamed back as fragmented MP4 while
+    it encodes, instead of the JSON response and a separate /download round trip.
+    Streamed renders are not stored, so the result cache does not apply to them.
+    """
+
+    # Check FFmpeg availability
+    require_ffmpeg()
+
+    validate_inspix_request(request)
+
+    # Generate unique ID for this request
+    request_id = str(uuid.uuid4())
+    if stream:
+        return await stream_inspix_request(request, request_id)
+    return await process_inspix_request(request, request_id, idempotency_key)
+
+@app.post("/jobs/generate-inspix-video", status_code=202)
+async def submit_inspix_job(
+    request: VideoGenerationRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    Queue an inspix video render and return immediately with a job id.
+    Poll GET /jobs/{job_id} for status; the result payload matches
+    /generate-inspix-video once the job has completed. Resubmitting with
+    the same Idempotency-Key returns the existing job; reusing the key with a
+    different body is rejected with 422.
+    """
+
+    # Check FFmpeg availability
+    require_ffmpeg()
+
+    validate_inspix_request(request)
+
+    if render_job_queue is None:
+        raise HTTPException(status_code=503, detail="Render workers not running")
+
+    fingerprint = canonical_hash(inspix_payload(request))
+    if idempotency_key and idempotency_key in render_job_keys:
+        existing = render_jobs[render_job_keys[idempotency_key]]
+        if existing["fingerprint"] != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+        return serialize_render_job(existing)
+
+    job_id = str(uuid.uuid4())
+    job = {
+        "job_id": job_id,
+        "status": "queued",
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+        "idempotency_key": idempotency_key,
+        "fingerprint": fingerprint,
+    }
+
+    try:
+        render_job_queue.put_nowait((job_id, request))
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Render queue is full, try again later",
+            headers={"Retry-After": str(render_admission.retry_after(render_job_queue.qsize()))}
+        )
+
+    render_jobs[job_id] = job
+    if idempotency_key:
+        render_job_keys[idempotency_key] = job_id
+    logger.info(f"Queued inspix job {job_id} (queue depth {render_job_queue.qsize()})")
+    return serialize_render_job(job)
+
+@app.get("/jobs/{job_id}")
+async def get_render_job(job_id: str):
+    """Get the status, and the result once finished, of a render job"""
+    job = render_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return serialize_render_job(job)
+
+@app.get("/jobs/{job_id}/events")
+async def stream_render_job_events(job_id: str, request: Request):
+    """
+    Server-Sent Events stream of a render job's status and progress.
+    An event is sent whenever the status payload changes; the stream ends
+    once the job has completed or failed.
+    """
+    if job_id not in render_jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events() -> AsyncIterator[bytes]:
+        last_event = None
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            job = render_jobs.get(job_id)
+            if job is None:
+                # Pruned from the job table
+                yield b"event: gone\ndata: {}\n\n"
+                return
+
+            payload = serialize_render_job(job)
+            event = json.dumps(payload, separators=(",", ":"))
+            if event != last_event:
+                yield f"event: {job['status']}\ndata: {event}\n\n".encode()
+                last_event = event
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= SSE_KEEPALIVE_INTERVAL:
+                yield b": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            if job["status"] in ("completed", "failed"):
+                return
+            await asyncio.sleep(PROGRESS_POLL_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/create-video")
 async def create_video(
-    image_urls: List[str] = Form(..., description="List of image URLs"),
+    image_urls: List[str] = Form([], description="List of image URLs"),
+    images: List[UploadFile] = File([], description="Image files, placed after any image URLs"),
     audio: Optional[UploadFile] = File(None, description="Optional audio file"),
     audio_url: Optional[str] = Form(None, description="Optional audio URL"),
     text_content: Optional[str] = Form(None, description="First text to display for first 3 seconds"),
     second_text_content: Optional[str] = Form(None, description="Second text to display from 3 seconds to end"),
     duration_per_image: float = Form(3.0, description="Duration per image in seconds"),
     transition_duration: float = Form(1.0, description="Transition duration in seconds"),
-    fps: int = Form(25, description="Output video FPS")
+    fps: int = Form(25, description="Output video FPS"),
+    render_profile: Optional[str] = Form(None, description="Encoder profile: draft, standard or archive"),
+    stream: bool = False
 ):
-    """Create video from image URLs with optional audio and text overlay"""
+    """
+    Create video from image URLs and/or uploaded image files with optional
+    audio and text overlay. With ?stream=true the final mux is streamed back
+    as fragmented MP4.
+    """
 
     # Check FFmpeg availability
-    if not check_ffmpeg():
-        raise HTTPException(status_code=503, detail="FFmpeg not available")
+    require_ffmpeg()
 
     # Validate inputs
-    if not image_urls or len(image_urls) == 0:
-        raise HTTPException(status_code=400, detail="At least one image URL is required")
+    images = [image for image in images if image.filename]
+    if not image_urls and not images:
+        raise HTTPException(status_code=400, detail="At least one image URL or image file is required")
 
-    if len(image_urls) > MAX_IMAGES:
+    if len(image_urls) + len(images) > MAX_IMAGES:
         raise HTTPException(status_code=400, detail=f"Maximum {MAX_IMAGES} images allowed")
 
+    for i, image in enumerate(images):
+        if not validate_image_format(image.filename):
+            raise HTTPException(status_code=400, detail=f"Image file {i+1} has unsupported format")
+        if not validate_file_size(image):
+            raise HTTPException(status_code=413, detail=f"Image file {i+1} is too large")
+
     # Validate that only one audio source is provided
     if audio and audio.filename and audio_url:
         raise HTTPException(status_code=400, detail="Provide either audio file or audio URL, not both")
@@ -1614,47 +4659,76 @@ async def create_video(
     if audio_url and not validate_audio_url(audio_url):
         raise HTTPException(status_code=400, detail="Invalid audio URL format")
 
+    render_profile = render_profile or DEFAULT_SLIDESHOW_PROFILE
+    if render_profile not in RENDER_PROFILES:
+        raise HTTPException(status_code=400, detail=f"render_profile must be one of: {', '.join(RENDER_PROFILES)}")
+
+    # Wait for a render slot (or get a 429) before downloading anything
+    release_slot = await render_admission.acquire()
+
     # Generate unique ID for this request
     request_id = str(uuid.uuid4())
     request_dir = UPLOAD_DIR / request_id
     request_dir.mkdir(exist_ok=True)
 
     try:
-        # Download images from URLs
-        image_paths = []
-        async with aiohttp.ClientSession() as session:
-            for i, url in enumerate(image_urls):
-                # Get appropriate extension
-                extension = get_image_extension_from_url(url)
-                image_path = request_dir / f"image_{i:04d}{extension}"
-
-                # Download image
+        # Download images (and audio URL) concurrently, cancelling the rest on the first failure
+        audio_path = None
+        session = get_http_session()
+        download_slots = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+        async def download_image(i: int, url: str) -> Path:
+            # Get appropriate extension
+            extension = get_image_extension_from_url(url)
+            image_path = request_dir / f"image_{i:04d}{extension}"
+
+            # Download image
+            async with download_slots:
                 result = await download_image_from_url(session, url, image_path)
-                if not result.get("success"):
-                    error_msg = result.get("error", "Unknown error")
-                    raise HTTPException(status_code=400, detail=f"Failed to download image {i+1} from URL: {url}. Error: {error_msg}")
+            if not result.get("success"):
+                error_msg = result.get("error", "Unknown error")
+                raise HTTPException(status_code=400, detail=f"Failed to download image {i+1} from URL: {url}. Error: {error_msg}")
 
-                # Validate downloaded file exists and has content
-                if not image_path.exists() or image_path.stat().st_size == 0:
-                    raise HTTPException(status_code=400, detail=f"Downloaded image {i+1} is empty or corrupted")
+            # Validate downloaded file exists and has content
+            if not image_path.exists() or image_path.stat().st_size == 0:
+                raise HTTPException(status_code=400, detail=f"Downloaded image {i+1} is empty or corrupted")
 
-                image_paths.append(image_path)
+            return image_path
 
-            # Handle audio if provided via URL
-            audio_path = None
-            if audio_url:
-                # Get appropriate extension
-                extension = get_audio_extension_from_url(audio_url)
-                audio_path = request_dir / f"audio{extension}"
+        async def download_audio() -> Path:
+            # Get appropriate extension
+            extension = get_audio_extension_from_url(audio_url)
+            audio_path = request_dir / f"audio{extension}"
 
-                # Download audio
+            # Download audio
+            async with download_slots:
                 success = await download_audio_from_url(session, audio_url, audio_path)
-                if not success:
-                    raise HTTPException(status_code=400, detail=f"Failed to download audio from URL: {audio_url}")
+            if not success:
+                raise HTTPException(status_code=400, detail=f"Failed to download audio from URL: {audio_url}")
 
-                # Validate downloaded file exists and has content
-                if not audio_path.exists() or audio_path.stat().st_size == 0:
-                    raise HTTPException(status_code=400, detail="Downloaded audio is empty or corrupted")
+            # Validate downloaded file exists and has content
+            if not audio_path.exists() or audio_path.stat().st_size == 0:
+                raise HTTPException(status_code=400, detail="Downloaded audio is empty or corrupted")
+
+            return audio_path
+
+        downloads = [download_image(i, url) for i, url in enumerate(image_urls)]
+        # Handle audio if provided via URL
+        if audio_url:
+            downloads.append(download_audio())
+
+        downloaded = await gather_or_cancel(*downloads)
+        image_paths = downloaded[:len(image_urls)]
+        if audio_url:
+            audio_path = downloaded[-1]
+
+        # Uploaded images follow the URL images
+        for i, image in enumerate(images, start=len(image_urls)):
+            image_path = request_dir / f"image_{i:04d}{Path(image.filename).suffix.lower()}"
+            saved = await save_upload_file(image, image_path)
+            if saved["size"] == 0:
+                raise HTTPException(status_code=400, detail=f"Image file {i - len(image_urls) + 1} is empty")
+            image_paths.append(image_path)
 
         # Handle audio if provided as uploaded file
         if audio and audio.filename and not audio_url:
@@ -1673,22 +4747,39 @@ async def create_video(
         final_video_path = OUTPUT_DIR / output_filename
 
         # Generate video from images with text overlay
-        success = create_video_from_images(
+        started = time.monotonic()
+        success = await create_video_from_images(
             image_paths,
-            temp_video_path if audio_path else final_video_path,
+            temp_video_path if audio_path or stream else final_video_path,
             duration_per_image,
             transition_duration,
             fps,
             text_content,
-            second_text_content
+            second_text_content,
+            render_profile
         )
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to create video from images")
 
+        if stream:
+            # The mux (audio, if any) is the last step; stream it instead of writing final_video_path
+            async def cleanup() -> None:
+                release_slot()
+                temp_video_path.unlink(missing_ok=True)
+                await remove_directory(request_dir)
+
+            return await streaming_video_response(
+                build_audio_mux_command(temp_video_path, audio_path, fragmented_mp4_output()),
+                300,
+                output_filename,
+                cleanup,
+                headers={"X-Video-Id": request_id}
+            )
+
         # Add audio if provided
         if audio_path:
-            success = add_audio_to_video(temp_video_path, audio_path, final_video_path)
+            success = await add_audio_to_video(temp_video_path, audio_path, final_video_path)
             if not success:
                 raise HTTPException(status_code=500, detail="Failed to add audio to video")
 
@@ -1697,10 +4788,11 @@ async def create_video(
                 temp_video_path.unlink()
 
         # Clean up uploaded files
-        shutil.rmtree(request_dir, ignore_errors=True)
+        await remove_directory(request_dir)
 
         if not final_video_path.exists():
             raise HTTPException(status_code=500, detail="Video file was not created")
+        RENDER_SECONDS.labels(engine="slideshow", profile=render_profile).observe(time.monotonic() - started)
 
         # Return success response
         return {
@@ -1709,56 +4801,118 @@ async def create_video(
             "download_url": f"/download/{output_filename}",
             "file_size": final_video_path.stat().st_size,
             "images_processed": len(image_paths),
+            "images_uploaded": len(images),
             "audio_added": audio_path is not None,
             "audio_source": "url" if audio_url else ("file" if audio and audio.filename else None),
             "text_added": text_content is not None,
-            "second_text_added": second_text_content is not None
+            "second_text_added": second_text_content is not None,
+            "render_profile": render_profile
         }
 
     except HTTPException:
         # Clean up on error
-        shutil.rmtree(request_dir, ignore_errors=True)
+        await remove_directory(request_dir)
+        release_slot()
         raise
     except Exception as e:
         # Clean up on error
-        shutil.rmtree(request_dir, ignore_errors=True)
+        await remove_directory(request_dir)
+        release_slot()
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        # A streamed response releases its slot once the stream ends
+        if not stream:
+            release_slot()
+
+@app.api_route("/download/{filename}", methods=["GET", "HEAD"])
+async def download_video(filename: str, request: Request):
+    """
+    Download generated video. Supports single byte ranges (206), an ETag with
+    If-None-Match/304, and long-lived caching since a rendered filename never
+    changes content.
+    """
+    # Only plain names inside OUTPUT_DIR; no separators, no hidden files
+    if not re.fullmatch(r"[\w-][\w.-]*", filename):
+        raise HTTPException(status_code=404, detail="File not found")
 
-@app.get("/download/{filename}")
-async def download_video(filename: str):
-    """Download generated video"""
     file_path = OUTPUT_DIR / filename
 
-    if not file_path.exists():
+    if not file_path.is_file():
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="video/mp4"
-    )
+    # The janitor may delete the output at any point; a file that is gone is a 404
+    try:
+        stat = file_path.stat()
+        if request.method == "GET":
+            # The atime marks the last download for the janitor's LRU; the mtime (and ETag) stay put
+            os.utime(file_path, ns=(time.time_ns(), stat.st_mtime_ns))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    # Outputs are never rewritten in place, so size and mtime identify the content
+    # without hashing the whole file on download
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": f"public, max-age={DOWNLOAD_MAX_AGE}, immutable",
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if DOWNLOAD_ACCEL_REDIRECT_PREFIX:
+        # nginx serves the body (and handles ranges) from its internal location
+        headers["X-Accel-Redirect"] = f"{DOWNLOAD_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{filename}"
+        return Response(headers=headers, media_type="video/mp4")
+
+    size = stat.st_size
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = parse_byte_range(range_header, size)
+
+    # Open before any header is sent: once open, a deletion no longer affects the body
+    try:
+        file = await asyncio.to_thread(open, file_path, "rb")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    if byte_range is None:
+        return VideoFileResponse(file, 0, size - 1, 200, headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return VideoFileResponse(file, start, end, 206, headers)
 
 @app.delete("/cleanup/{video_id}")
 async def cleanup_video(video_id: str):
-    """Clean up generated video file"""
-    file_path = OUTPUT_DIR / f"video_{video_id}.mp4"
+    """Clean up a generated video file (slideshow or inspix)"""
+    if re.fullmatch(r"[\w-]+", video_id):
+        for prefix in OUTPUT_PREFIXES:
+            file_path = OUTPUT_DIR / f"{prefix}{video_id}.mp4"
+            if file_path.exists():
+                file_path.unlink()
+                return {"message": "Video deleted successfully"}
 
-    if file_path.exists():
-        file_path.unlink()
-        return {"message": "Video deleted successfully"}
-    else:
-        raise HTTPException(status_code=404, detail="Video not found")
+    raise HTTPException(status_code=404, detail="Video not found")
 
 @app.get("/list-videos")
 async def list_videos():
     """List all generated videos"""
     videos = []
-    for file_path in OUTPUT_DIR.glob("video_*.mp4"):
+    for file_path in OUTPUT_DIR.glob("*.mp4"):
+        if not file_path.name.startswith(OUTPUT_PREFIXES):
+            continue
+        stat = file_path.stat()
         videos.append({
             "filename": file_path.name,
-            "size": file_path.stat().st_size,
-            "created": file_path.stat().st_ctime,
+            "size": stat.st_size,
+            "created": stat.st_ctime,
             "download_url": f"/download/{file_path.name}"
         })
 
@@ -10,6 +10,7 @@ import json
 # API Configuration
 API_BASE_URL = "http://localhost:8000"
 GENERATE_ENDPOINT = f"{API_BASE_URL}/generate-inspix-video"
+JOBS_ENDPOINT = f"{API_BASE_URL}/jobs/generate-inspix-video"
 
 def test_video_generation():
     """Test the inspix video generation endpoint"""
@@ -149,6 +150,41 @@ def test_minimal_request():
     except Exception as e:
         print(f"❌ Error: {e}")
 
+def test_idempotency_key_reuse():
+    """Test that reusing an Idempotency-Key with a different body is rejected"""
+    print("\n🔑 Testing Idempotency-Key Reuse (job endpoint)\n")
+
+    headers = {"Idempotency-Key": f"test-{time.time()}"}
+    first_request = {
+        "original_image_url": "https://picsum.photos/1200/1200",
+        "result_image_urls": ["https://picsum.photos/1200/1200?random=1"]
+    }
+    second_request = dict(first_request, prompt_preview_text="A different request")
+
+    try:
+        first = requests.post(JOBS_ENDPOINT, json=first_request, headers=headers, timeout=30)
+        if first.status_code != 202:
+            print(f"❌ First submission failed: HTTP {first.status_code}")
+            print(first.text)
+            return
+
+        replay = requests.post(JOBS_ENDPOINT, json=first_request, headers=headers, timeout=30)
+        if replay.status_code == 202 and replay.json()["job_id"] == first.json()["job_id"]:
+            print(f"✅ Same key and body returned job {first.json()['job_id']}")
+        else:
+            print(f"❌ Same key and body: HTTP {replay.status_code}")
+            print(replay.text)
+
+        mismatch = requests.post(JOBS_ENDPOINT, json=second_request, headers=headers, timeout=30)
+        if mismatch.status_code == 422:
+            print(f"✅ Same key with a different body rejected: {mismatch.json()['detail']}")
+        else:
+            print(f"❌ Expected 422 for a different body, got HTTP {mismatch.status_code}")
+            print(mismatch.text)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
 if __name__ == "__main__":
     print("=" * 60)
     print("  Inspix Video Generation API - Test Suite")
@@ -163,8 +199,9 @@ if __name__ == "__main__":
     print("1. Full request (with all optional fields)")
     print("2. Minimal request (only required fields)")
     print("3. Both")
+    print("4. Idempotency-Key reuse (job endpoint)")
 
-    choice = input("\nEnter choice (1-3): ").strip()
+    choice = input("\nEnter choice (1-4): ").strip()
 
     if choice == "1":
         test_video_generation()
@@ -174,6 +211,8 @@ if __name__ == "__main__":
         test_video_generation()
         print("\n" + "=" * 60 + "\n")
         test_minimal_request()
+    elif choice == "4":
+        test_idempotency_key_reuse()
     else:
         print("Invalid choice. Running full test...")
         test_video_generation()